@@ -1,16 +1,39 @@
-from .agent import Failure, build_primary_agent
-from .configs import ModelConfig, ToolsConfig
-from .agents.context import AgentContext
-from .event_sys import (
-    EventBus,
-    EventHandler,
-    EventSubscription,
-    EventType,
-    StreamOutEvent,
-    UserInputEvent,
-    get_event_bus,
-    reset_event_bus,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .agents.context import AgentContext
+    from .agents.primary import Failure, agent, get_agent
+    from .configs import ModelConfig, ToolsConfig
+    from .event_sys import (
+        EventBus,
+        EventHandler,
+        EventSubscription,
+        EventType,
+        StreamOutEvent,
+        UserInputEvent,
+        get_event_bus,
+        reset_event_bus,
+    )
+
+# Symbols are imported on first access (PEP 562) so that `import lib` does not pull in
+# pydantic-ai models and provider SDKs until they are actually needed.
+_LAZY_IMPORTS: dict[str, str] = {
+    "AgentContext": ".agents.context",
+    "EventBus": ".event_sys",
+    "EventHandler": ".event_sys",
+    "EventSubscription": ".event_sys",
+    "EventType": ".event_sys",
+    "Failure": ".agents.primary",
+    "ModelConfig": ".configs",
+    "StreamOutEvent": ".event_sys",
+    "ToolsConfig": ".configs",
+    "UserInputEvent": ".event_sys",
+    "agent": ".agents.primary",
+    "get_agent": ".agents.primary",
+    "get_event_bus": ".event_sys",
+    "reset_event_bus": ".event_sys",
+}
 
 __all__ = (
     "AgentContext",
@@ -24,7 +47,20 @@ __all__ = (
     "ToolsConfig",
     "UserInputEvent",
     "agent",
-    "build_primary_agent",
+    "get_agent",
     "get_event_bus",
     "reset_event_bus",
 )
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
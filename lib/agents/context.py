@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from string import Template
 from typing import Protocol
@@ -21,6 +23,11 @@ from .prompts import (
 
 logger = logging.getLogger(__name__)
 
+# Static parts of the system prompt, concatenated once at import
+_PROMPT_PREFIX = CORE_SYSTEM_MESSAGE + "\n\n"
+_PROMPT_SUFFIX = "\n\n" + INTERACTION_EXAMPLES + "\n\n" + FINAL_MESSAGE
+_EMPTY_CONTEXT_PROMPT = CORE_SYSTEM_MESSAGE + _PROMPT_SUFFIX
+
 
 class HasEventBus(Protocol):
     """Protocol ensuring that a class has an event_bus attribute of type EventBus."""
@@ -33,112 +40,134 @@ class AgentContext(HasEventBus):
     workspace_path: str
     event_bus: EventBus
 
-    @property
-    def is_workspace_empty(self) -> bool:
-        """
-        Check if the workspace directory is empty.
-        """
-        return not any(Path(self.workspace_path).iterdir())
-
-    @property
-    def is_git_repository(self) -> bool:
-        """
-        Check if the workspace is a git repository.
-        """
-        return is_git_repository(self.workspace_path)
-
-    @property
-    def is_python_project(self) -> bool:
-        """
-        Check if the workspace contains Python files.
-        """
-        return has_python_files(self.workspace_path)
+    is_workspace_empty: bool = field(init=False)
+    is_git_repository: bool = field(init=False)
+    is_python_project: bool = field(init=False)
+    is_node_project: bool = field(init=False)
+    # Environment flags, read once when the context is built
+    _in_docker: bool = field(init=False, repr=False)
+    _in_sandbox: bool = field(init=False, repr=False)
 
-    @property
-    def is_node_project(self) -> bool:
+    def __post_init__(self) -> None:
         """
-        Check if the workspace contains Python files.
+        Probe the workspace and environment once; the flags are plain slot reads afterwards.
         """
-        return has_node_files(self.workspace_path)
+        object.__setattr__(self, "is_workspace_empty", _is_directory_empty(self.workspace_path))
+        object.__setattr__(self, "is_git_repository", is_git_repository(self.workspace_path))
+        object.__setattr__(self, "is_python_project", has_python_files(self.workspace_path))
+        object.__setattr__(self, "is_node_project", has_node_files(self.workspace_path))
+        object.__setattr__(self, "_in_docker", bool(os.environ.get("DOCKER_CONTAINER")))
+        object.__setattr__(self, "_in_sandbox", bool(os.environ.get("SANDBOX_CONTEXT")))
 
     @property
     def is_docker_container(self) -> bool:
         """
         Check if the agent is running inside a Docker container.
         """
-        return bool(os.environ.get("DOCKER_CONTAINER"))
+        return self._in_docker
 
     @property
     def is_sandboxed(self) -> bool:
         """
         Check if the agent is running in a sandboxed environment.
         """
-        return bool(os.environ.get("SANDBOX_CONTEXT")) or bool(os.environ.get("DOCKER_CONTAINER"))
+        return self._in_sandbox or self._in_docker
 
-    def _retrieve_system_message(self) -> str | None:
+    @staticmethod
+    def invalidate_prompt_cache() -> None:
         """
-        Retrieve the system message from the file.
+        Drop all cached system prompts, e.g. after the workspace changed on disk.
         """
-        _system_md_var = os.environ.get("SYSTEM_MD", "").lower()
-
-        if not _system_md_var:
-            return None
-
-        config_dir = Path(self.workspace_path) / ".config"
-        if config_dir.exists():
-            _system_message_file = config_dir / "system_messages.md"
-            if Path(_system_message_file).exists():
-                with open(_system_message_file, "r") as f:
-                    return f.read()
-            return None
-        return None
+        _build_system_prompt.cache_clear()
+        _load_system_md.cache_clear()
 
-    def _retrieve_sandbox_context(self) -> str:
-        """
-        Retrieve the sandbox context for the system message.
-        """
-        if os.environ.get("SANDBOX_CONTEXT"):
-            return SANDBOX_CONTEXT_MESSAGE
-        if os.environ.get("DOCKER_CONTAINER"):
-            return DOCKER_CONTAINER_MESSAGE
-        return Template(DIRECT_SYSTEM_ACCESS_MESSAGE).safe_substitute(CURRENT_WORKING_DIRECTORY=self.workspace_path)
-
-    def _retrieve_git_context(self) -> str | None:
-        if is_git_repository(self.workspace_path):
-            return GIT_CONTEXT_MESSAGE
+    def get_agent_system_prompt(self) -> str:
+        # SYSTEM_MD is read on every call and passed in, so toggling it is part of the cache key
+        use_system_md = bool(os.environ.get("SYSTEM_MD", ""))
+        return _build_system_prompt(
+            self.workspace_path,
+            use_system_md,
+            self._in_sandbox,
+            self._in_docker,
+            self.is_git_repository,
+            self.is_python_project,
+        )
+
+    async def aget_agent_system_prompt(self) -> str:
+        """
+        Async variant of get_agent_system_prompt; the first build reads from disk
+        in a worker thread so it never blocks the event loop.
+        """
+        return await asyncio.to_thread(self.get_agent_system_prompt)
+
+
+def _is_directory_empty(workspace_path: str) -> bool:
+    try:
+        with os.scandir(workspace_path) as entries:
+            return next(entries, None) is None
+    except OSError:
+        return True
+
+
+def _retrieve_system_message(workspace_path: str, use_system_md: bool) -> str | None:
+    """
+    Retrieve the system message from the file.
+    """
+    if not use_system_md:
         return None
-
-    def _retrieve_python_context(self) -> str | None:
-        """
-        Retrieve the core system message.
-        """
-        if has_python_files(self.workspace_path):
-            return PYTHON_CONTEXT_MESSAGE
+    return _load_system_md(workspace_path)
+
+
+@lru_cache(maxsize=32)
+def _load_system_md(workspace_path: str) -> str | None:
+    """
+    Read .config/system_messages.md from the workspace once; later calls hit the cache.
+    """
+    _system_message_file = Path(workspace_path) / ".config" / "system_messages.md"
+    try:
+        with open(_system_message_file, "r") as f:
+            return f.read()
+    except OSError:
         return None
 
-    def get_agent_system_prompt(self) -> str:
-        _system_message = self._retrieve_system_message()
-        if _system_message:
-            return _system_message
-        _context_informations = []
-        _sandbox_context = self._retrieve_sandbox_context()
-        if _sandbox_context:
-            _context_informations.append(_sandbox_context)
-        _git_context = self._retrieve_git_context()
-        if _git_context:
-            _context_informations.append(_git_context)
-        _has_python_context = self._retrieve_python_context()
-        if _has_python_context:
-            _context_informations.append(_has_python_context)
-
-        if _context_informations:
-            return (
-                CORE_SYSTEM_MESSAGE
-                + "\n\n"
-                + "\n".join(_context_informations)
-                + "\n\n"
-                + INTERACTION_EXAMPLES
-                + "\n\n"
-                + FINAL_MESSAGE
-            )
-        return CORE_SYSTEM_MESSAGE + "\n\n" + INTERACTION_EXAMPLES + "\n\n" + FINAL_MESSAGE
+
+def _retrieve_sandbox_context(workspace_path: str, in_sandbox: bool, in_docker: bool) -> str:
+    """
+    Retrieve the sandbox context for the system message.
+    """
+    if in_sandbox:
+        return SANDBOX_CONTEXT_MESSAGE
+    if in_docker:
+        return DOCKER_CONTAINER_MESSAGE
+    return Template(DIRECT_SYSTEM_ACCESS_MESSAGE).safe_substitute(CURRENT_WORKING_DIRECTORY=workspace_path)
+
+
+# Every input that changes the prompt is an argument, so it is part of the lru_cache key
+@lru_cache(maxsize=32)
+def _build_system_prompt(  # noqa: PLR0913
+    workspace_path: str,
+    use_system_md: bool,
+    in_sandbox: bool,
+    in_docker: bool,
+    is_git_repo: bool,
+    is_python_project: bool,
+) -> str:
+    """
+    Build the agent system prompt for a workspace.
+    The workspace layout is static within a session, so the result is cached per workspace path.
+    """
+    _system_message = _retrieve_system_message(workspace_path, use_system_md)
+    if _system_message:
+        return _system_message
+    _context_informations = []
+    _sandbox_context = _retrieve_sandbox_context(workspace_path, in_sandbox, in_docker)
+    if _sandbox_context:
+        _context_informations.append(_sandbox_context)
+    if is_git_repo:
+        _context_informations.append(GIT_CONTEXT_MESSAGE)
+    if is_python_project:
+        _context_informations.append(PYTHON_CONTEXT_MESSAGE)
+
+    if _context_informations:
+        return "".join((_PROMPT_PREFIX, "\n".join(_context_informations), _PROMPT_SUFFIX))
+    return _EMPTY_CONTEXT_PROMPT
@@ -1,37 +1,61 @@
 # ruff: noqa: PLC0415
+from __future__ import annotations
+
 import os
+from functools import cache
+from typing import TYPE_CHECKING
 
-from pydantic_ai.models import Model
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI, AsyncOpenAI
+    from pydantic_ai.models import Model
 
 
-def _build_azure_model(model_name: str) -> Model:
+# Clients are shared across model instances so that every agent reuses the same
+# underlying httpx connection pool instead of opening new connections per model.
+@cache
+def _azure_client(endpoint: str, deployment: str, api_version: str, api_key: str) -> AsyncAzureOpenAI:
     from openai import AsyncAzureOpenAI
+
+    return AsyncAzureOpenAI(
+        azure_endpoint=endpoint,
+        azure_deployment=deployment,
+        api_version=api_version,
+        api_key=api_key,
+    )
+
+
+@cache
+def _openai_client() -> AsyncOpenAI:
+    from openai import AsyncOpenAI
+
+    # OPENAI_API_KEY  is required for OpenAI models
+    return AsyncOpenAI()
+
+
+def _build_azure_model(model_name: str) -> Model:
     from pydantic_ai.models.openai import OpenAIModel
     from pydantic_ai.providers.azure import AzureProvider
 
     return OpenAIModel(
         model_name,
         provider=AzureProvider(
-            openai_client=AsyncAzureOpenAI(
-                azure_endpoint=os.environ.get("AZURE_API_BASE", ""),
-                azure_deployment=model_name,
-                api_version=os.environ.get("AZURE_API_VERSION", ""),
-                api_key=os.environ.get("AZURE_API_KEY", ""),
+            openai_client=_azure_client(
+                os.environ.get("AZURE_API_BASE", ""),
+                model_name,
+                os.environ.get("AZURE_API_VERSION", ""),
+                os.environ.get("AZURE_API_KEY", ""),
             )
         ),
     )
 
 
 def _build_openai_model(model_name: str) -> Model:
-    from openai import AsyncOpenAI
     from pydantic_ai.models.openai import OpenAIModel
     from pydantic_ai.providers.openai import OpenAIProvider
 
-    # OPENAI_API_KEY  is required for OpenAI models
-
     return OpenAIModel(
         model_name,
-        provider=OpenAIProvider(openai_client=AsyncOpenAI()),
+        provider=OpenAIProvider(openai_client=_openai_client()),
     )
 
 
@@ -1,11 +1,11 @@
+# ruff: noqa: PLC0415
 import logging
-from typing import Union
+from functools import cache
+from typing import Any, Union
 
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext, Tool
 
-from lib.tools import edit_file, glob_search, list_directory, read_file, write_file
-
 from .context import AgentContext
 from .factories import llm_factory
 
@@ -18,22 +18,36 @@ class Failure(BaseModel):
     reason: str = Field(description="The Reason why the task failed")
 
 
-agent = Agent[AgentContext, str | Failure](
-    name="CoderAgent",
-    model=llm_factory(),
-    tools=[
-        Tool(read_file, takes_ctx=True),
-        Tool(list_directory, takes_ctx=True),
-        Tool(write_file, takes_ctx=True),
-        Tool(glob_search, takes_ctx=True),
-        Tool(edit_file, takes_ctx=True),
-    ],
-    deps_type=AgentContext,
-    output_type=Union[str, Failure],  # type: ignore  # noqa: PGH003
-    retries=3,
-)
-
-
-@agent.system_prompt
 async def get_system_prompt(ctx: RunContext[AgentContext]) -> str:
-    return ctx.deps.get_agent_system_prompt()
+    return await ctx.deps.aget_agent_system_prompt()
+
+
+# The model client and the tool modules are only loaded when the agent is first needed,
+# so importing this module (e.g. for Failure) stays cheap.
+@cache
+def get_agent() -> Agent[AgentContext, str | Failure]:
+    from lib.tools import edit_file, glob_search, list_directory, read_file, write_file
+
+    agent = Agent[AgentContext, str | Failure](
+        name="CoderAgent",
+        model=llm_factory(),
+        tools=[
+            Tool(read_file, takes_ctx=True),
+            Tool(list_directory, takes_ctx=True),
+            Tool(write_file, takes_ctx=True),
+            Tool(glob_search, takes_ctx=True),
+            Tool(edit_file, takes_ctx=True),
+        ],
+        deps_type=AgentContext,
+        output_type=Union[str, Failure],  # type: ignore  # noqa: PGH003
+        retries=3,
+    )
+    agent.system_prompt(get_system_prompt)
+    return agent
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from lib.agents.primary import agent` working without building the agent at import time
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,12 +7,20 @@ from pydantic_ai.messages import (
 )
 
 from lib.agents.context import HasEventBus
+from lib.event_sys import BatchedStreamOut, StreamOutEvent
 
 # TAgentDeps = TypeVar("TAgentDeps", bound=AgentDeps)
 
 
 async def handel_streaming_events(
-    ctx: RunContext[HasEventBus], event_stream: AsyncIterable[AgentStreamEvent | HandleResponseEvent]
+    ctx: RunContext[HasEventBus],
+    event_stream: AsyncIterable[AgentStreamEvent | HandleResponseEvent],
+    session_id: str = "agent",
 ) -> None:
-    async for event in event_stream:
-        ctx.deps.event_bus.emit(event)
+    # Text deltas are coalesced before they reach the bus, so subscribers see fewer, larger chunks
+    batcher = BatchedStreamOut(ctx.deps.event_bus.emit)
+    try:
+        async for event in event_stream:
+            await batcher.push(StreamOutEvent(session_id=session_id, data=event))
+    finally:
+        await batcher.aclose()
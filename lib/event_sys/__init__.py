@@ -2,9 +2,10 @@
 import logging
 
 from .async_bus import EventBus, EventSubscription
-from .types import EventHandler, EventType, StreamOutEvent, UserInputEvent
+from .types import BatchedStreamOut, EventHandler, EventType, StreamOutEvent, UserInputEvent
 
 __all__ = (
+    "BatchedStreamOut",
     "EventBus",
     "EventHandler",
     "EventSubscription",
@@ -13,7 +14,6 @@ __all__ = (
     "UserInputEvent",
     "get_event_bus",
     "reset_event_bus",
-    "reset_event_bus",
 )
 
 logger = logging.getLogger("event_sys")
@@ -36,6 +36,7 @@ async def reset_event_bus() -> None:
     global _event_bus
     if _event_bus is not None:
         await _event_bus.clear_all()
+        _event_bus.shutdown()
     _event_bus = None
     logger.debug("Reset global ModernEventBus instance")
 
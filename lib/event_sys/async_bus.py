@@ -3,21 +3,37 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager, suppress
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from weakref import WeakSet
 
 from typing_extensions import Self
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Sequence
 
     from .types import EventHandler, EventType, StreamOutEvent, UserInputEvent
 
 logger = logging.getLogger("event_sys")
 
+T = TypeVar("T")
+
+# Cancelled subscriptions stay in the dispatch lists as tombstones until this share of them is reached
+COMPACT_TOMBSTONE_RATIO = 0.25
+COMPACT_MIN_SUBSCRIPTIONS = 64
+
+# Warn when this many queued-subscription workers are alive at once
+MAX_BACKGROUND_TASKS = 10_000
+
+# Initial ring buffer size of an unbounded RingQueue
+UNBOUNDED_RING_CAPACITY = 64
+
 
 class BackpressureStrategy(Enum):
     """Strategy for handling backpressure when queues are full"""
@@ -27,29 +43,143 @@ class BackpressureStrategy(Enum):
     BLOCK = "block"  # Block until space available
 
 
+class RingQueue(Generic[T]):
+    """
+    Single-consumer queue backed by a power-of-two ring buffer.
+    Mirrors the subset of asyncio.Queue used by subscriptions and adds an O(1) drop-oldest put.
+    As with asyncio.Queue, a maxsize <= 0 means unbounded; the buffer then doubles when it fills up.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(0, maxsize)
+        capacity = 1 << (self.maxsize - 1).bit_length() if self.maxsize else UNBOUNDED_RING_CAPACITY
+        self._buf: list[T | None] = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def qsize(self) -> int:
+        return self._tail - self._head
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._tail - self._head
+
+    def _grow(self) -> None:
+        size = self._tail - self._head
+        buf = [self._buf[(self._head + i) & self._mask] for i in range(size)]
+        buf.extend([None] * size)
+        self._buf = buf
+        self._mask = len(buf) - 1
+        self._head = 0
+        self._tail = size
+
+    def _push(self, item: T) -> None:
+        if self._tail - self._head > self._mask:
+            # Only reachable when unbounded; a bounded buffer always holds maxsize items
+            self._grow()
+        self._buf[self._tail & self._mask] = item
+        self._tail += 1
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+
+    def _pop(self) -> T:
+        index = self._head & self._mask
+        item = self._buf[index]
+        self._buf[index] = None
+        self._head += 1
+        self._not_full.set()
+        return item  # type: ignore[return-value]
+
+    def put_nowait(self, item: T) -> None:
+        if self.full():
+            raise asyncio.QueueFull
+        self._push(item)
+
+    def put_drop_oldest(self, item: T) -> bool:
+        """Put item, overwriting the oldest one when full. Returns True if an item was dropped."""
+        dropped = self.full()
+        if dropped:
+            self._buf[self._head & self._mask] = None
+            self._head += 1
+        self._push(item)
+        return dropped
+
+    async def put(self, item: T) -> None:
+        while self.full():
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._push(item)
+
+    def get_nowait(self) -> T:
+        if self._head == self._tail:
+            raise asyncio.QueueEmpty
+        return self._pop()
+
+    async def get(self) -> T:
+        while self._head == self._tail:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._pop()
+
+    def task_done(self) -> None:
+        """Kept for asyncio.Queue compatibility; completion is not tracked."""
+
+
 class EventSubscription:
     """Represents a subscription that can be cancelled"""
 
-    def __init__(
+    # The dispatch options after the queue settings are keyword-only, so call sites stay readable
+    def __init__(  # noqa: PLR0913
         self,
         event_bus: EventBus,
         event_type: EventType,
         handler: EventHandler,
         queue_size: int = 1000,
         backpressure_strategy: BackpressureStrategy = BackpressureStrategy.DROP_OLDEST,
+        *,
+        direct: bool = False,
+        once: bool = False,
+        session_filter: str | None = None,
     ):
         self.event_bus = event_bus
         self.event_type = event_type
         self.handler = handler
         self._cancelled = False
+        # Only events of this session are accepted; the bus already routes by session, so emit() skips the check
+        self.session_filter = session_filter
+        # Direct subscriptions run the handler from emit() instead of a queue worker
+        self.direct = direct
+        # One-shot subscriptions cancel themselves after their first event
+        self._once = once
+        # Bus-registered queued subscriptions only run a worker while events are pending
+        self._on_demand = False
+        # Decided once here so dispatch only branches on a bool
+        self._is_coro = _is_async_handler(handler)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Sync handlers run on the bus's bounded pool; fall back to the loop default when detached
+        self._executor: ThreadPoolExecutor | None = event_bus.executor if isinstance(event_bus, EventBus) else None
 
         # Backpressure handling
         self.queue_size = queue_size
+        # Every strategy shares the ring buffer, so switching strategies at runtime keeps the queued events
+        self.event_queue: RingQueue[StreamOutEvent | UserInputEvent] = RingQueue(queue_size)
+        # Producers blocked by BLOCK wait here; set when room is freed, the strategy changes or on cancel
+        self._producers_wakeup = asyncio.Event()
+        self._blocked_producers = 0
+        # Setting the strategy binds the matching _try_enqueue_nowait implementation
         self.backpressure_strategy = backpressure_strategy
-        self.event_queue: asyncio.Queue[StreamOutEvent | UserInputEvent] = asyncio.Queue(maxsize=queue_size)
         self._processing_task: asyncio.Task | None = None
         self._dropped_events = 0
         self._processed_events = 0
+        # Set by the worker after each handled event; waiters clear it and re-check their condition
+        self._progress = asyncio.Event()
         self._sample_counter = 0
         self._sample_rate = 10  # Keep every 10th event when sampling
 
@@ -60,38 +190,136 @@ class EventSubscription:
         """
         if self._cancelled:
             return False
+        if self.session_filter is not None and event.session_id != self.session_filter:
+            return False
+        result = self._try_enqueue_nowait(event)
+        if isinstance(result, bool):
+            return result
+        return await result
+
+    @property
+    def backpressure_strategy(self) -> BackpressureStrategy:
+        return self._backpressure_strategy
+
+    @backpressure_strategy.setter
+    def backpressure_strategy(self, strategy: BackpressureStrategy) -> None:
+        self._backpressure_strategy = strategy
+        enqueue = self._select_enqueue(strategy)
+        if self._on_demand and not self.direct:
+            enqueue = self._waking(enqueue)
+        self._try_enqueue_nowait = enqueue
+        # Producers blocked under BLOCK re-check whether they still have to wait
+        self._wake_producers()
+
+    def _wake_producers(self) -> None:
+        if self._blocked_producers:
+            self._producers_wakeup.set()
+
+    def _run_on_demand(self) -> None:
+        """Start the queue worker when an event arrives and let it exit once the queue is drained"""
+        self._on_demand = True
+        self.backpressure_strategy = self._backpressure_strategy
+
+    def _waking(
+        self, enqueue: Callable[[StreamOutEvent | UserInputEvent], bool | Coroutine[Any, Any, bool]]
+    ) -> Callable[[StreamOutEvent | UserInputEvent], bool | Coroutine[Any, Any, bool]]:
+        def enqueue_and_wake(event: StreamOutEvent | UserInputEvent) -> bool | Coroutine[Any, Any, bool]:
+            result = enqueue(event)
+            if self._processing_task is None:
+                self.event_bus._start_subscription(self)  # noqa: SLF001
+            return result
+
+        return enqueue_and_wake
+
+    def _select_enqueue(
+        self, strategy: BackpressureStrategy
+    ) -> Callable[[StreamOutEvent | UserInputEvent], bool | Coroutine[Any, Any, bool]]:
+        """
+        Pick the enqueue implementation once per strategy instead of branching per event.
+        Each returns whether the event was queued when it could be handled synchronously,
+        or a coroutine to await when delivery has to wait (direct dispatch, full BLOCK queue).
+        Callers check cancellation first.
+        """
+        if self.direct:
+            return self._dispatch_once if self._once else self._dispatch
+        if strategy == BackpressureStrategy.BLOCK:
+            return self._enqueue_block
+        if strategy == BackpressureStrategy.DROP_NEWEST:
+            return self._enqueue_drop_newest
+        return self._enqueue_drop_oldest
+
+    def _enqueue_block(self, event: StreamOutEvent | UserInputEvent) -> bool | Coroutine[Any, Any, bool]:
+        try:
+            self.event_queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return self._enqueue_blocking(event)
 
+    def _enqueue_drop_newest(self, event: StreamOutEvent | UserInputEvent) -> bool:
         try:
-            if self.backpressure_strategy == BackpressureStrategy.BLOCK:
-                # Block until space is available
-                await self.event_queue.put(event)
-                return True
-
-            if self.backpressure_strategy == BackpressureStrategy.DROP_NEWEST:
-                # Drop the new event if queue is full
-                self.event_queue.put_nowait(event)
-                return True
-
-            if self.backpressure_strategy == BackpressureStrategy.DROP_OLDEST:
-                # Drop old events to make room for new ones
-                if self.event_queue.full():
-                    try:
-                        self.event_queue.get_nowait()  # Remove oldest
-                        self._dropped_events += 1
-                    except asyncio.QueueEmpty:
-                        pass
-                self.event_queue.put_nowait(event)
-                return True
+            self.event_queue.put_nowait(event)
+            return True
         except asyncio.QueueFull:
+            # Drop the new event since the queue is full
+            self._dropped_events += 1
+            return False
+
+    def _enqueue_drop_oldest(self, event: StreamOutEvent | UserInputEvent) -> bool:
+        # Overwrite the oldest slot to make room for the new event
+        if self.event_queue.put_drop_oldest(event):
             self._dropped_events += 1
+        return True
+
+    async def _enqueue_blocking(self, event: StreamOutEvent | UserInputEvent) -> bool:
+        """Block until space is available, the strategy stops being BLOCK or the subscription is cancelled"""
+        wakeup = self._producers_wakeup
+        self._blocked_producers += 1
+        try:
+            while (
+                not self._cancelled
+                and self._backpressure_strategy == BackpressureStrategy.BLOCK
+                and self.event_queue.full()
+            ):
+                wakeup.clear()
+                await wakeup.wait()
+        finally:
+            self._blocked_producers -= 1
+        if self._cancelled:
             return False
+        # Enqueue under the strategy in force now, which may have changed while waiting
+        result = self._try_enqueue_nowait(event)
+        return result if isinstance(result, bool) else await result
 
+    async def _dispatch(self, event: StreamOutEvent | UserInputEvent) -> bool:
+        """Run the handler for a direct subscription"""
+        try:
+            if self._is_coro:
+                await self.handler(event)
+            else:
+                if self._loop is None:
+                    self._loop = asyncio.get_running_loop()
+                # Run sync handler in thread pool to avoid blocking
+                await self._loop.run_in_executor(self._executor, self.handler, event)
+            self._processed_events += 1
+        except Exception as e:
+            logger.error("Error in event handler: %s", e)
         return True
 
+    def _dispatch_once(self, event: StreamOutEvent | UserInputEvent) -> Coroutine[Any, Any, bool]:
+        """Accept a single event, then stop accepting further ones"""
+        self.cancel()
+        return self._dispatch(event)
+
     async def start_processing(self) -> None:
-        """Start processing events from the queue"""
-        if self._processing_task is None:
-            self._processing_task = asyncio.create_task(self._process_events())
+        """Start processing events from the queue (no-op for direct subscriptions)"""
+        self._start_worker()
+
+    def _start_worker(self) -> asyncio.Task | None:
+        """Create the queue worker task if this subscription needs one"""
+        if self._processing_task is None and not self.direct:
+            self._loop = asyncio.get_running_loop()
+            self._processing_task = self._loop.create_task(self._process_events())
+        return self._processing_task
 
     async def stop_processing(self) -> None:
         """Stop processing events and cleanup"""
@@ -103,32 +331,38 @@ class EventSubscription:
 
     async def _process_events(self) -> None:
         """Process events from the queue"""
+        loop = self._loop or asyncio.get_running_loop()
         try:
-            while not self._cancelled:
+            while True:
+                # Sleep until an event arrives; cancel()/stop_processing() cancel the wait
+                event = await self.event_queue.get()
+                self._wake_producers()
+
+                # Process the event
                 try:
-                    # Get event with timeout to check cancellation
-                    event = await asyncio.wait_for(self.event_queue.get(), timeout=0.1)
+                    if self._is_coro:
+                        await self.handler(event)
+                    else:
+                        # Run sync handler in thread pool to avoid blocking
+                        await loop.run_in_executor(self._executor, self.handler, event)
 
-                    # Process the event
-                    try:
-                        if asyncio.iscoroutinefunction(self.handler):
-                            await self.handler(event)
-                        else:
-                            # Run sync handler in thread pool to avoid blocking
-                            await asyncio.get_event_loop().run_in_executor(None, self.handler, event)
+                    self._processed_events += 1
 
-                        self._processed_events += 1
-                        self.event_queue.task_done()
+                except Exception as e:
+                    logger.error("Error in event handler: %s", e)
+                self._progress.set()
 
-                    except Exception as e:
-                        logger.error(f"Error in event handler: {e}")
-                        self.event_queue.task_done()
+                if self._once:
+                    self.cancel()
+                    return
 
-                except asyncio.TimeoutError:
-                    continue
+                if self._on_demand and self.event_queue.empty():
+                    # Idle subscriptions hold no task; the next enqueue starts a new worker
+                    self._processing_task = None
+                    return
 
         except asyncio.CancelledError:
-            logger.debug(f"Event processing cancelled for {self.event_type}")
+            logger.debug("Event processing cancelled for %s", self.event_type)
 
     @property
     def stats(self) -> dict[str, Any]:
@@ -143,14 +377,17 @@ class EventSubscription:
         }
 
     def cancel(self) -> None:
-        """Cancel this subscription"""
-        if not self._cancelled:
-            self._cancelled = True
-            # Start cleanup task with proper reference handling
-            if self._processing_task:
-                cleanup_task = asyncio.create_task(self.stop_processing())
-                # Store reference temporarily to prevent GC, it will be cleaned up when done
-                cleanup_task.add_done_callback(lambda t: None)
+        """Cancel this subscription synchronously; no cleanup task is scheduled"""
+        if self._cancelled:
+            return
+        self._cancelled = True
+        self._wake_producers()
+        # Stop the worker; stop_processing() later awaits it and drops the reference
+        task = self._processing_task
+        if task is not None and not task.done():
+            task.cancel()
+        if isinstance(self.event_bus, EventBus):
+            self.event_bus._subscription_cancelled()  # noqa: SLF001
 
     @property
     def is_cancelled(self) -> bool:
@@ -166,21 +403,17 @@ class EventSubscription:
 class SessionEventSubscription(EventSubscription):
     """Session-specific subscription with automatic cleanup"""
 
-    def __init__(self, event_bus: EventBus, session_id: str, event_type: EventType, handler: EventHandler):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        session_id: str,
+        event_type: EventType,
+        handler: EventHandler,
+        direct: bool = False,
+    ):
         self.session_id = session_id
-
-        # Create session-filtered handler
-        async def session_handler(event: StreamOutEvent | UserInputEvent) -> None:
-            if event.session_id == session_id:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(event)
-                    else:
-                        handler(event)
-                except Exception as e:
-                    logger.error(f"Error in session handler for {session_id}: {e}")
-
-        super().__init__(event_bus, event_type, session_handler)
+        # The bus only routes events of this session here, so no filtering wrapper is needed
+        super().__init__(event_bus, event_type, handler, direct=direct, session_filter=session_id)
         self.original_handler = handler
 
 
@@ -195,34 +428,87 @@ class EventBus:
         self._session_subscriptions: dict[str, list[SessionEventSubscription]] = defaultdict(list)
         self._lock = asyncio.Lock()
 
-        # Subscriptions organized by event type
-        self._subscriptions: dict[EventType, list[EventSubscription]] = defaultdict(list)
+        # Subscriptions keyed by (event type, session id); bus-wide subscriptions use session id None
+        self._subscriptions: dict[tuple[EventType, str | None], list[EventSubscription]] = defaultdict(list)
+
+        # Registered vs. cancelled-but-not-yet-removed subscriptions, used to trigger compaction
+        self._subscription_count = 0
+        self._tombstone_count = 0
 
-        # Track background tasks to prevent garbage collection
-        self._background_tasks: set[asyncio.Task] = set()
+        # Worker tasks are owned by their subscriptions (_processing_task); the bus only observes them
+        self._background_tasks: WeakSet[asyncio.Task] = WeakSet()
+        # Fire-and-forget deliveries from emit_nowait(); nothing else references them
+        self._pending_deliveries: set[asyncio.Task] = set()
+
+        # Set on every emit so a UI thread can block on it instead of polling; the waiter clears it
+        self.refresh_signal = threading.Event()
 
         # Default settings
         self.default_queue_size = default_queue_size
         self.default_backpressure_strategy = default_backpressure_strategy
 
-    def _create_background_task(self, coro) -> asyncio.Task:
-        """Create a background task and track it to prevent garbage collection"""
-        task = asyncio.create_task(coro)
-        self._background_tasks.add(task)
-
-        # Remove task from set when it's done to prevent memory leaks
-        def remove_task(task_ref: asyncio.Task) -> None:
-            self._background_tasks.discard(task_ref)
+        # Bounded pool shared by all sync handlers of this bus
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(4, default_queue_size // 100), thread_name_prefix="event_bus"
+        )
 
-        task.add_done_callback(remove_task)
-        return task
+    def _register(self, key: tuple[EventType, str | None], subscription: EventSubscription) -> None:
+        """Add a subscription to the dispatch table; queued ones start a worker when events arrive"""
+        self._subscriptions[key].append(subscription)
+        self._subscription_count += 1
+        if not subscription.direct:
+            subscription._run_on_demand()  # noqa: SLF001
+
+    def _subscription_cancelled(self) -> None:
+        """Record a tombstone and compact the dispatch table once they make up a large share of it"""
+        self._tombstone_count += 1
+        if (
+            self._subscription_count >= COMPACT_MIN_SUBSCRIPTIONS
+            and self._tombstone_count > self._subscription_count * COMPACT_TOMBSTONE_RATIO
+        ):
+            self._compact()
+
+    def _compact(self) -> int:
+        """Drop cancelled subscriptions and empty keys; returns the number removed"""
+        removed_count = 0
+        compacted: dict[tuple[EventType, str | None], list[EventSubscription]] = defaultdict(list)
+        for key, subscriptions in self._subscriptions.items():
+            # Build new lists so an in-flight emit keeps iterating the old ones safely
+            active_subscriptions = [subscription for subscription in subscriptions if not subscription.is_cancelled]
+            removed_count += len(subscriptions) - len(active_subscriptions)
+            if active_subscriptions:
+                compacted[key] = active_subscriptions
+        self._subscriptions = compacted
+        self._subscription_count -= removed_count
+        self._tombstone_count = 0
+        logger.debug("Compacted %s cancelled subscriptions", removed_count)
+        return removed_count
+
+    def _start_subscription(self, subscription: EventSubscription) -> None:
+        """Start the queue worker of a subscription and track it"""
+        task = subscription._start_worker()  # noqa: SLF001
+        if task is None or task in self._background_tasks:
+            return
+        background_tasks = self._background_tasks
+        background_tasks.add(task)
+        # Discard as soon as the worker finishes rather than when the subscription is collected
+        task.add_done_callback(background_tasks.discard)
+        if len(background_tasks) > MAX_BACKGROUND_TASKS:
+            logger.warning(
+                "%s event bus workers are running; queued subscriptions may be leaking", len(background_tasks)
+            )
 
     def subscribe(
         self,
         event_type: EventType,
         handler: EventHandler,
+        direct: bool = True,
     ) -> EventSubscription:
-        """Subscribe to events with backpressure handling"""
+        """
+        Subscribe to events with backpressure handling.
+        Direct subscriptions are invoked from emit(); pass direct=False for slow handlers
+        that should run on their own queue worker.
+        """
 
         # Always use backpressure subscription with default settings
         subscription = EventSubscription(
@@ -231,80 +517,140 @@ class EventBus:
             handler,
             self.default_queue_size,
             self.default_backpressure_strategy,
+            direct=direct,
         )
 
-        self._subscriptions[event_type].append(subscription)
-
-        # Start processing task
-        self._create_background_task(subscription.start_processing())
+        # Register; queued subscriptions get a worker only while they have events
+        self._register((event_type, None), subscription)
 
-        logger.debug(f"Subscribed handler to {event_type} with backpressure")
+        logger.debug("Subscribed handler to %s with backpressure", event_type)
         return subscription
 
-    def subscribe_once(self, event_type: EventType, handler: EventHandler) -> EventSubscription:
+    def subscribe_once(self, event_type: EventType, handler: EventHandler, direct: bool = True) -> EventSubscription:
         """Subscribe to event once"""
-
-        # Create a wrapper handler that cancels itself after first execution
-        async def once_wrapper(event: StreamOutEvent | UserInputEvent) -> None:
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
-            finally:
-                # Cancel this subscription after handling the event
-                subscription.cancel()
-
-        # Create backpressure subscription with wrapper
         subscription = EventSubscription(
             self,
             event_type,
-            once_wrapper,
+            handler,
             self.default_queue_size,
             self.default_backpressure_strategy,
+            direct=direct,
+            once=True,
         )
 
-        self._subscriptions[event_type].append(subscription)
-
-        # Start processing task
-        self._create_background_task(subscription.start_processing())
+        # Register; queued subscriptions get a worker only while they have events
+        self._register((event_type, None), subscription)
 
-        logger.debug(f"Subscribed one-time handler to {event_type}")
+        logger.debug("Subscribed one-time handler to %s", event_type)
         return subscription
 
     def subscribe_session(
-        self, session_id: str, event_type: EventType, handler: EventHandler
+        self, session_id: str, event_type: EventType, handler: EventHandler, direct: bool = True
     ) -> SessionEventSubscription:
         """Subscribe to events for a specific session"""
-        subscription = SessionEventSubscription(self, session_id, event_type, handler)
-
-        # Add to subscriptions by event type
-        self._subscriptions[event_type].append(subscription)
+        subscription = SessionEventSubscription(self, session_id, event_type, handler, direct=direct)
 
         # Add to session tracking
         self._session_subscriptions[session_id].append(subscription)
 
-        # Start processing task
-        self._create_background_task(subscription.start_processing())
+        # Register by event type and session; queued subscriptions get a worker only while they have events
+        self._register((event_type, session_id), subscription)
 
-        logger.debug(f"Subscribed session handler for {session_id} to {event_type}")
+        logger.debug("Subscribed session handler for %s to %s", session_id, event_type)
         return subscription
 
-    async def emit(self, event: StreamOutEvent | UserInputEvent) -> None:
+    def _fan_out(self, event: StreamOutEvent | UserInputEvent) -> list[Coroutine[Any, Any, bool]]:
         """
-        Emit event to all subscribers.
-        Returns statistics about event delivery.
+        Enqueue event on every matching subscription without yielding.
+        Returns the deliveries that still have to be awaited (direct handlers, full BLOCK queues).
+        Nothing awaits inside the loop, so the lists cannot change while they are walked.
         """
+        if not self.refresh_signal.is_set():
+            self.refresh_signal.set()
         event_type = event.event_type
+        subscriptions_by_key = self._subscriptions
+        bus_subscriptions = subscriptions_by_key.get((event_type, None))
+        session_subscriptions = subscriptions_by_key.get((event_type, event.session_id))
+        slow: list[Coroutine[Any, Any, bool]] = []
+        if not bus_subscriptions and not session_subscriptions:
+            return slow
+
+        for subscriptions in (bus_subscriptions, session_subscriptions):
+            if not subscriptions:
+                continue
+            for subscription in subscriptions:
+                if subscription.is_cancelled:
+                    continue
+                result = subscription._try_enqueue_nowait(event)  # noqa: SLF001
+                if not isinstance(result, bool):
+                    slow.append(result)
+        return slow
 
-        try:
-            for subscription in self._subscriptions[event_type]:
+    async def emit(self, event: StreamOutEvent | UserInputEvent) -> None:
+        """
+        Emit event to all subscribers and wait until direct handlers have run.
+        Handler errors are caught at the dispatch/worker call sites, so no try/except is needed here.
+        """
+        slow = self._fan_out(event)
+        if not slow:
+            return
+        if len(slow) == 1:
+            await slow[0]
+        else:
+            _log_failures(await asyncio.gather(*slow, return_exceptions=True), event.event_type)
+
+    def emit_nowait(self, event: StreamOutEvent | UserInputEvent) -> None:
+        """
+        Emit event without waiting for direct handlers; their deliveries run as tracked tasks.
+        Unlike emit(), ordering between successive events is not guaranteed for handlers that await.
+        """
+        for coro in self._fan_out(event):
+            task = asyncio.ensure_future(coro)
+            self._pending_deliveries.add(task)
+            task.add_done_callback(self._delivery_done)
+
+    def _delivery_done(self, task: asyncio.Task) -> None:
+        self._pending_deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error emitting event: %s", task.exception())
+
+    async def emit_many(self, events: Iterable[StreamOutEvent | UserInputEvent]) -> None:
+        """
+        Emit a batch of events, e.g. all stream parts produced in one model turn.
+        Subscriptions are looked up once per (event type, session) and each subscription
+        still sees its events in order; awaiting only happens once the whole batch is enqueued.
+        """
+        targets_by_key: dict[tuple[EventType, str | None], Sequence[EventSubscription]] = {}
+        pending: dict[EventSubscription, list[Coroutine[Any, Any, bool]]] = {}
+
+        for event in events:
+            key = (event.event_type, event.session_id)
+            targets = targets_by_key.get(key)
+            if targets is None:
+                bus_subscriptions = self._subscriptions.get((key[0], None))
+                session_subscriptions = self._subscriptions.get(key)
+                # Only build a combined snapshot when both lists have entries
+                if bus_subscriptions and session_subscriptions:
+                    targets = (*bus_subscriptions, *session_subscriptions)
+                else:
+                    targets = bus_subscriptions or session_subscriptions or ()
+                targets_by_key[key] = targets
+            for subscription in targets:
                 if subscription.is_cancelled:
                     continue
-                success = await subscription.enqueue_event(event)
-                logger.debug(f"Enqueued event {event_type} for subscription {subscription.event_type}: {success}")
-        except Exception as e:
-            logger.error(f"Error emitting event {event_type}: {e}")
+                result = subscription._try_enqueue_nowait(event)  # noqa: SLF001
+                if not isinstance(result, bool):
+                    pending.setdefault(subscription, []).append(result)
+
+        if targets_by_key and not self.refresh_signal.is_set():
+            self.refresh_signal.set()
+        if not pending:
+            return
+        slow = [_await_in_order(coros) for coros in pending.values()]
+        if len(slow) == 1:
+            await slow[0]
+        else:
+            _log_failures(await asyncio.gather(*slow, return_exceptions=True), "batch")
 
     async def cleanup_session(self, session_id: str) -> None:
         """Clean up all handlers for a session"""
@@ -317,12 +663,19 @@ class EventBus:
             for subscription in subscriptions:
                 subscription.cancel()
 
+            # Drop the session's dispatch lists outright instead of leaving tombstones for compaction
+            for event_type in {subscription.event_type for subscription in subscriptions}:
+                removed = self._subscriptions.pop((event_type, session_id), None)
+                if removed:
+                    self._subscription_count -= len(removed)
+                    self._tombstone_count -= len(removed)
+
             del self._session_subscriptions[session_id]
-            logger.debug(f"Cleaned up {len(subscriptions)} handlers for session {session_id}")
+            logger.debug("Cleaned up %s handlers for session %s", len(subscriptions), session_id)
 
     def get_session_handler_count(self, session_id: str) -> int:
         """Get number of active handlers for a session"""
-        return len([sub for sub in self._session_subscriptions[session_id] if not sub.is_cancelled])
+        return sum(not sub.is_cancelled for sub in self._session_subscriptions.get(session_id, ()))
 
     def get_active_sessions(self) -> list[str]:
         """Get list of sessions with active handlers"""
@@ -334,7 +687,12 @@ class EventBus:
 
     def get_handler_count(self, event_type: EventType) -> int:
         """Get total number of handlers for an event type"""
-        return len([sub for sub in self._subscriptions[event_type] if not sub.is_cancelled])
+        return sum(
+            not sub.is_cancelled
+            for (subscribed_type, _), subscriptions in self._subscriptions.items()
+            if subscribed_type == event_type
+            for sub in subscriptions
+        )
 
     def get_backpressure_stats(self) -> dict[str, Any]:
         """Get statistics for all subscriptions"""
@@ -346,10 +704,10 @@ class EventBus:
             "subscriptions": [],
         }
 
-        for event_type, subscriptions in self._subscriptions.items():
+        for (event_type, _), subscriptions in self._subscriptions.items():
             for subscription in subscriptions:
                 sub_stats = subscription.stats
-                stats["subscriptions"].append({"event_type": str(event_type), **sub_stats})
+                stats["subscriptions"].append({"event_type": event_type, **sub_stats})
                 stats["total_subscriptions"] += 1
 
                 if not subscription.is_cancelled:
@@ -361,23 +719,17 @@ class EventBus:
 
     async def cleanup_cancelled_subscriptions(self) -> int:
         """Remove cancelled subscriptions and return count removed"""
+        # Every cancellation is counted as a tombstone, so without any there is nothing to scan
+        if not self._tombstone_count:
+            return 0
         async with self._lock:
-            removed_count = 0
-
-            for event_type, subscriptions in self._subscriptions.items():
-                # Create a new list without cancelled subscriptions
-                active_subscriptions = []
+            for subscriptions in self._subscriptions.values():
                 for subscription in subscriptions:
                     if subscription.is_cancelled:
                         await subscription.stop_processing()
-                        removed_count += 1
-                    else:
-                        active_subscriptions.append(subscription)
-
-                # Update the list for this event type
-                self._subscriptions[event_type] = active_subscriptions
 
-            logger.debug(f"Cleaned up {removed_count} cancelled subscriptions")
+            removed_count = self._compact()
+            logger.debug("Cleaned up %s cancelled subscriptions", removed_count)
             return removed_count
 
     async def set_global_backpressure_strategy(self, strategy: BackpressureStrategy) -> None:
@@ -390,7 +742,7 @@ class EventBus:
                     if not subscription.is_cancelled:
                         subscription.backpressure_strategy = strategy
 
-            logger.info(f"Updated global backpressure strategy to {strategy.value}")
+            logger.info("Updated global backpressure strategy to %s", strategy.value)
 
     async def clear_all(self) -> None:
         """Clear all handlers and sessions"""
@@ -407,8 +759,14 @@ class EventBus:
                     sub.cancel()
 
             self._session_subscriptions.clear()
+            self._subscription_count = 0
+            self._tombstone_count = 0
             logger.debug("Cleared all handlers and sessions")
 
+    def shutdown(self) -> None:
+        """Release the sync-handler thread pool without waiting for running handlers"""
+        self.executor.shutdown(wait=False)
+
     @asynccontextmanager
     async def temporary_subscription(
         self, event_type: EventType, handler: EventHandler
@@ -419,3 +777,24 @@ class EventBus:
             yield subscription
         finally:
             subscription.cancel()
+
+
+def _is_async_handler(handler: EventHandler) -> bool:
+    """True for coroutine functions, including partials and objects with an async __call__"""
+    if inspect.iscoroutinefunction(handler):
+        return True
+    # __call__ is looked up on the type, as calling the object does
+    return callable(handler) and inspect.iscoroutinefunction(type(handler).__call__)
+
+
+async def _await_in_order(coros: list[Coroutine[Any, Any, bool]]) -> None:
+    """Await one subscription's pending deliveries sequentially to keep event order"""
+    for coro in coros:
+        await coro
+
+
+def _log_failures(results: list[Any], event_type: str) -> None:
+    """Log exceptions collected by asyncio.gather(return_exceptions=True)"""
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Error emitting event %s: %s", event_type, result)
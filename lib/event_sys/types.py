@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Literal, cast
+from dataclasses import dataclass, replace
+from functools import cached_property
+from itertools import groupby
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Literal, cast, get_args
 
 from pydantic_ai.messages import (
     AgentStreamEvent,
@@ -14,6 +18,7 @@ from pydantic_ai.messages import (
     HandleResponseEvent,
     PartDeltaEvent,
     PartStartEvent,
+    TextPartDelta,
 )
 
 if TYPE_CHECKING:
@@ -48,28 +53,49 @@ EventType = Literal[
     "input | exit",
 ]
 
+# Canonical routing keys by (event_kind, part kind), so event_type hands out shared strings instead of formatting them
+_EVENT_TYPE_STRINGS: dict[tuple[str, str], EventType] = {
+    cast("tuple[str, str]", tuple(event_type.split(" | ", 1))): event_type
+    for event_type in get_args(EventType)
+    if " | " in event_type
+}
+
+# Exact-type lookup for the part kind of each stream event; subclasses go through _event_kind_fallback
+_EVENT_KIND_EXTRACTORS: dict[type, Callable[[Any], str]] = {
+    PartStartEvent: attrgetter("part.part_kind"),
+    FunctionToolCallEvent: attrgetter("part.part_kind"),
+    BuiltinToolCallEvent: attrgetter("part.part_kind"),
+    PartDeltaEvent: attrgetter("delta.part_delta_kind"),
+    FinalResultEvent: lambda _: "",
+    FunctionToolResultEvent: attrgetter("result.part_kind"),
+    BuiltinToolResultEvent: attrgetter("result.part_kind"),
+}
+
+
+def _event_kind_fallback(data: AgentStreamEvent | HandleResponseEvent) -> str:
+    if isinstance(data, (PartStartEvent, FunctionToolCallEvent, BuiltinToolCallEvent)):
+        return data.part.part_kind
+    if isinstance(data, PartDeltaEvent):
+        return data.delta.part_delta_kind
+    if isinstance(data, FinalResultEvent):
+        return ""
+    if isinstance(data, (FunctionToolResultEvent, BuiltinToolResultEvent)):
+        return data.result.part_kind
+    return "Unknown"
+
 
 @dataclass
 class StreamOutEvent:
     session_id: str
     data: AgentStreamEvent | HandleResponseEvent
 
-    @property
+    @cached_property
     def event_type(self) -> EventType:
-        type2_ = "Unknown"
-        if isinstance(self.data, (PartStartEvent, FunctionToolCallEvent, BuiltinToolCallEvent)):
-            type2_ = self.data.part.part_kind
-        elif isinstance(self.data, PartDeltaEvent):  # Changed to elif
-            type2_ = self.data.delta.part_delta_kind
-        elif isinstance(self.data, FinalResultEvent):  # Changed to elif
-            type2_ = ""
-        elif isinstance(self.data, (FunctionToolResultEvent, BuiltinToolResultEvent)):  # Changed to elif
-            type2_ = self.data.result.part_kind
+        """Routing key, computed on first access and cached on the instance"""
+        extractor = _EVENT_KIND_EXTRACTORS.get(type(self.data))
+        type2_ = extractor(self.data) if extractor is not None else _event_kind_fallback(self.data)
 
-        if type2_ == "Unknown":
-            return "Unknown"
-
-        return cast("EventType", f"{self.data.event_kind} | {type2_}")
+        return _EVENT_TYPE_STRINGS.get((self.data.event_kind, type2_), "Unknown")
 
     @property
     def timestamp(self) -> datetime | None:
@@ -91,11 +117,102 @@ class UserInputEvent:
     data: str
     timestamp: datetime
 
-    @property
+    @cached_property
     def event_type(self) -> EventType:
-        if self.data.startswith("/"):
-            return "input | command"
-        return "input | text"
+        """Routing key, computed on first access and cached on the instance"""
+        return "input | command" if self.data[:1] == "/" else "input | text"
+
+
+class BatchedStreamOut:
+    """Coalesces bursts of text deltas into fewer StreamOutEvents before handing them to a handler
+
+    Consecutive text deltas of the same part are merged into a single delta once ``flush_size`` of them are
+    buffered or ``flush_interval_ms`` has passed since the first one. Any other event flushes the buffer first,
+    so the handler always sees events in their original order.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[StreamOutEvent], Awaitable[Any]],
+        flush_interval_ms: float = 20,
+        flush_size: int = 16,
+    ) -> None:
+        self._handler = handler
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_size = flush_size
+        self._buffer: list[StreamOutEvent] = []
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+        self._timer_error: Exception | None = None
+
+    async def push(self, event: StreamOutEvent) -> None:
+        """Buffer a text delta, or flush the buffer and forward any other event"""
+        if isinstance(event.data, PartDeltaEvent) and isinstance(event.data.delta, TextPartDelta):
+            self._buffer.append(event)
+            if len(self._buffer) >= self.flush_size:
+                # Deltas buffered after this flush get a full interval from their own timer
+                self._cancel_timer()
+                await self.flush()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+            return
+        async with self._lock:
+            await self._flush_buffer()
+            await self._handler(event)
+
+    async def flush(self) -> None:
+        """Deliver everything buffered so far"""
+        async with self._lock:
+            await self._flush_buffer()
+
+    async def aclose(self) -> None:
+        """Flush the buffer and stop the pending flush timer
+
+        Raises:
+            Exception: the first error the handler raised during a timed flush, which no caller awaited
+        """
+        self._cancel_timer()
+        await self.flush()
+        if self._timer_error is not None:
+            error, self._timer_error = self._timer_error, None
+            raise error
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # Cleared before flushing, so cancelling the timer can only ever interrupt the sleep
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            if self._timer_error is None:
+                self._timer_error = e
+
+    async def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        for event in _merge_text_deltas(buffer):
+            await self._handler(event)
+
+
+def _merge_text_deltas(events: list[StreamOutEvent]) -> list[StreamOutEvent]:
+    """Merge runs of text deltas that belong to the same session and part"""
+    merged: list[StreamOutEvent] = []
+    for (session_id, _), run in groupby(events, key=lambda e: (e.session_id, cast("PartDeltaEvent", e.data).index)):
+        batch = list(run)
+        if len(batch) == 1:
+            merged.append(batch[0])
+            continue
+        first = cast("PartDeltaEvent", batch[0].data)
+        text = "".join(cast("TextPartDelta", cast("PartDeltaEvent", e.data).delta).content_delta for e in batch)
+        delta = replace(cast("TextPartDelta", first.delta), content_delta=text)
+        merged.append(StreamOutEvent(session_id=session_id, data=replace(first, delta=delta)))
+    return merged
 
 
 # Type aliases
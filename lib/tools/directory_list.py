@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import os
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
@@ -9,8 +11,17 @@ from lib.agents.context import AgentContext
 
 logger = logging.getLogger(__name__)
 
+MAX_DEPTH_LIMIT = 10
+# Threads used to walk the subdirectories of a recursive listing; each holds at most one open
+# directory handle per depth level, so this also bounds the descriptors a listing keeps open
+WALK_WORKERS = max(1, int(os.environ.get("DIRLIST_MAX_CONCURRENCY", "8")))
+# Indent prefixes for every depth a listing can reach, shared by all output lines
+_INDENTS = tuple("  " * depth for depth in range(MAX_DEPTH_LIMIT + 1))
 
-@dataclass(frozen=True, slots=True)
+
+# Not frozen: a frozen dataclass assigns every field through object.__setattr__, which makes the
+# per-entry construction in _walk several times slower
+@dataclass(slots=True)
 class DirectoryEntry:
     """Information about a directory entry."""
 
@@ -31,12 +42,15 @@ class DirectoryInfo:
     files: int = 0
 
 
-async def list_directory(
+# Each argument after ctx is a tool parameter the model sets
+async def list_directory(  # noqa: PLR0913
     ctx: RunContext[AgentContext],
     path: str = ".",
     show_hidden: bool = False,
     recursive: bool = False,
     max_depth: int = 3,
+    *,
+    include_size: bool = False,
 ) -> ToolReturn:
     """
     List the contents of a directory.
@@ -45,6 +59,7 @@ async def list_directory(
         show_hidden: Include hidden files and directories (default: False)
         recursive: List directories recursively (default: False)
         max_depth: Maximum depth to list (default: 3, min: 1, max: 10)
+        include_size: Show the size of each file, at the cost of one stat per file (default: False)
     Returns:
         Formatted directory listing with information about files and directories
     """
@@ -56,8 +71,7 @@ async def list_directory(
     )
     # Validate max_depth
     min_depth_limit = 1
-    max_depth_limit = 10
-    max_depth = max(min_depth_limit, min(max_depth, max_depth_limit))
+    max_depth = max(min_depth_limit, min(max_depth, MAX_DEPTH_LIMIT))
     dir_path = Path(path).resolve()
     if not dir_path.exists():
         logger.warning(f"Directory not found: {path}")
@@ -76,33 +90,33 @@ async def list_directory(
 
     try:
         # Resolve path relative to workspace root if it's not absolute
-        entries = await _list_directory_recursive(dir_path, show_hidden, recursive, max_depth, 0)
+        entries = await _list_directory_recursive(
+            dir_path, show_hidden, recursive, max_depth, 0, include_size=include_size
+        )
+        # Format detailed output for content, counting directories in the same pass
+        output_lines = [f"# Directory listing for: `{path}`", "", ""]  # Header, stats line, empty line
+        directories = 0
+        append = output_lines.append
+        for entry in entries:
+            if entry.is_dir:
+                directories += 1
+                append(_INDENTS[entry.depth] + entry.name + "/")
+            elif include_size:
+                append(_INDENTS[entry.depth] + entry.name + " (" + str(entry.size) + " bytes)")
+            else:
+                append(_INDENTS[entry.depth] + entry.name)
         # Prepare info for metadata
         dir_info = DirectoryInfo(
             path=str(dir_path),
             total_entries=len(entries),
-            directories=sum(1 for e in entries if e.is_dir),
-            files=sum(1 for e in entries if not e.is_dir),
+            directories=directories,
+            files=len(entries) - directories,
         )
         # Format the summary for return_value
-        summary = {
-            f"Directory: {path} - ",
-            f"{dir_info.total_entries} items ",
-            f"({dir_info.directories} directories, {dir_info.files} files)",
-        }
-        # Format detailed output for content
-        output_lines = [f"# Directory listing for: `{path}`"]
-        # Add stats line
-        output_lines.append(
-            f"- Total: {dir_info.total_entries} items ({dir_info.directories} directories, {dir_info.files} files)"
-        )
-        output_lines.append("")  # Empty line before listing
-        # Add entries
-        for entry in entries:
-            indent = "  " * entry.depth
-            type_indicator = "/" if entry.is_dir else ""
-            size_info = f" ({entry.size} bytes)" if not entry.is_dir else ""
-            output_lines.append(f"{indent}{entry.name}{type_indicator}{size_info}")
+        counts = f"{dir_info.total_entries} items ({dir_info.directories} directories, {dir_info.files} files)"
+        summary = f"Directory: {path} - {counts}"
+        # Fill in the stats line
+        output_lines[1] = f"- Total: {counts}"
         logger.info(f"Successfully listed directory: {path} with {dir_info.total_entries} items")
         # Return the result with both summary and detailed content
         return ToolReturn(
@@ -135,33 +149,101 @@ async def list_directory(
         )
 
 
-async def _list_directory_recursive(
-    path: Path, show_hidden: bool, recursive: bool, max_depth: int, current_depth: int
+# Mirrors list_directory's tool parameters, plus the depth the walk starts at
+async def _list_directory_recursive(  # noqa: PLR0913
+    path: Path,
+    show_hidden: bool,
+    recursive: bool,
+    max_depth: int,
+    current_depth: int,
+    *,
+    include_size: bool = True,
+) -> list[DirectoryEntry]:
+    """List directory contents without blocking the event loop, walking sibling subtrees in parallel."""
+    # The top level is listed on its own; recursion below it is handed to the workers
+    entries = await asyncio.to_thread(_walk, path, show_hidden, current_depth, current_depth, include_size)
+    if not recursive or max_depth <= current_depth:
+        return entries
+    subdirs = [index for index, entry in enumerate(entries) if entry.is_dir]
+    if not subdirs:
+        return entries
+    # Each worker walks an interleaved share of the subdirectories so thread hand-offs stay bounded
+    workers = min(len(subdirs), WALK_WORKERS)
+    shares = [subdirs[worker::workers] for worker in range(workers)]
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                _walk_many,
+                [entries[index].path for index in share],
+                show_hidden,
+                max_depth,
+                current_depth + 1,
+                include_size,
+            )
+            for share in shares
+        )
+    )
+    subtrees: dict[int, list[DirectoryEntry]] = {}
+    for share, share_subtrees in zip(shares, results, strict=True):
+        subtrees.update(zip(share, share_subtrees, strict=True))
+    # Splice each subtree back in right after its directory entry
+    listing: list[DirectoryEntry] = []
+    for index, entry in enumerate(entries):
+        listing.append(entry)
+        subtree = subtrees.get(index)
+        if subtree:
+            listing.extend(subtree)
+    return listing
+
+
+def _walk_many(
+    roots: list[str], show_hidden: bool, max_depth: int, depth: int, include_size: bool
+) -> list[list[DirectoryEntry]]:
+    return [_walk(root, show_hidden, max_depth, depth, include_size) for root in roots]
+
+
+def _walk(
+    root: str | Path, show_hidden: bool, max_depth: int, current_depth: int = 0, include_size: bool = True
 ) -> list[DirectoryEntry]:
-    """List directory contents recursively."""
-    entries = []
+    """Walk ``root`` depth-first with an explicit stack, listing each subdirectory right after its entry."""
+    entries: list[DirectoryEntry] = []
+    skip_hidden = not show_hidden
+    try:
+        stack = [(os.scandir(root), current_depth)]
+    except PermissionError:
+        # Handle permission denied for the main directory
+        logger.debug(f"Permission denied listing directory: {root}")
+        return entries
     try:
-        for item in path.iterdir():
-            # Skip hidden files if not requested
-            if not show_hidden and item.name.startswith("."):
+        while stack:
+            it, depth = stack[-1]
+            item = next(it, None)
+            if item is None:
+                it.close()
+                stack.pop()
+                continue
+            name = item.name
+            # Skip hidden files if not requested; entry names are never empty
+            if skip_hidden and name[0] == ".":
                 continue
-            try:
-                # Get file size if it's a file
-                size = item.stat().st_size if item.is_file() else 0
-            except OSError:
+            # DirEntry caches the type bits from readdir, so is_dir/stat avoid repeated syscalls per entry
+            is_dir = item.is_dir(follow_symlinks=False)
+            # Get file size if it's a file and sizes were asked for; without them no stat is issued
+            if include_size and not is_dir:
+                try:
+                    size = item.stat(follow_symlinks=False).st_size
+                except OSError:
+                    size = 0
+            else:
                 size = 0
-            entry = DirectoryEntry(name=item.name, path=str(item), is_dir=item.is_dir(), depth=current_depth, size=size)
-            entries.append(entry)
-            if recursive and item.is_dir() and current_depth < max_depth:
+            entries.append(DirectoryEntry(name, item.path, is_dir, depth, size))
+            if is_dir and depth < max_depth:
                 try:
-                    sub_entries = await _list_directory_recursive(
-                        item, show_hidden, recursive, max_depth, current_depth + 1
-                    )
-                    entries.extend(sub_entries)
+                    stack.append((os.scandir(item.path), depth + 1))
                 except PermissionError:
                     # Skip directories we can't access
-                    logger.debug(f"Permission denied for subdirectory: {item}")
-    except PermissionError:
-        # Handle permission denied for the main directory
-        logger.debug(f"Permission denied listing directory: {path}")
+                    logger.debug(f"Permission denied for subdirectory: {item.path}")
+    finally:
+        for it, _ in stack:
+            it.close()
     return entries
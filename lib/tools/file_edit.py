@@ -1,20 +1,21 @@
+import asyncio
 import difflib
 import logging
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
-import aiofiles
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ToolReturn
 
 from lib.agents.context import AgentContext
 
-from .utils import read_file_content
+from .utils import is_within_root
 
 logger = logging.getLogger(__name__)
 
 MAX_PREVIEW_LENGTH = 100
 MAX_CONTENT_PREVIEW = 1000
+MAX_DIFF_SIZE = 200_000  # Characters; difflib is too slow to diff larger files inline
 
 
 @dataclass(frozen=True, slots=True)
@@ -43,6 +44,23 @@ def _generate_diff(old_content: str | None, new_content: str, file_path: Path) -
     return "".join(diff)
 
 
+def _write_file(file_path: Path, content: str) -> None:
+    """Write content to a file, creating parent directories as needed."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content, encoding="utf-8")
+
+
+async def _write_and_diff(file_path: Path, old_content: str, new_content: str, replacements: int) -> str:
+    """Write the new content in the background while the diff is computed off the event loop."""
+    write_task = asyncio.create_task(asyncio.to_thread(_write_file, file_path, new_content))
+    try:
+        if max(len(old_content), len(new_content)) < MAX_DIFF_SIZE:
+            return await asyncio.to_thread(_generate_diff, old_content, new_content, file_path)
+        return f"(diff omitted; {replacements} replacement(s) over {len(new_content)} characters)"
+    finally:
+        await write_task
+
+
 async def edit_file(
     ctx: RunContext[AgentContext],
     file_path: str,
@@ -61,8 +79,9 @@ async def edit_file(
     """
     workspace_path = ctx.deps.workspace_path
     logger.debug(f"Running edit_file with workspace_path: {workspace_path}")
+    path_obj = Path(file_path)
 
-    if not Path(file_path).is_absolute():
+    if not path_obj.is_absolute():
         logger.debug(f"File path is not absolute, resolving relative to workspace: {file_path}")
         return ToolReturn(
             return_value=f"Error: file_path must be absolute: {file_path}",
@@ -73,7 +92,7 @@ async def edit_file(
             metadata={"success": False, "error": "invalid_file_path"},
         )
 
-    if not Path(file_path).is_relative_to(Path(workspace_path)):
+    if not is_within_root(file_path, workspace_path):
         return ToolReturn(
             return_value=f"File path must be within workspace directory ({workspace_path}): {file_path}",
             content=[
@@ -83,7 +102,7 @@ async def edit_file(
             metadata={"success": False, "error": "base_path_outside_root"},
         )
 
-    if Path(file_path).is_dir():
+    if path_obj.is_dir():
         return ToolReturn(
             return_value=f"Error: file_path must be a file, not a directory: {file_path}",
             content=[
@@ -97,9 +116,11 @@ async def edit_file(
     new_content = None
     is_new_file = False
 
-    if Path(file_path).is_file():
-        current_content, error = await read_file_content(Path(file_path))
-        if error is not None:
+    if path_obj.is_file():
+        # One blocking read in a worker thread is cheaper than aiofiles' per-call thread hops
+        try:
+            current_content = await asyncio.to_thread(path_obj.read_text, encoding="utf-8")
+        except Exception as error:
             return ToolReturn(
                 return_value=f"Could not read file: {error!s}",
                 content=[
@@ -140,7 +161,9 @@ async def edit_file(
             metadata={"success": False, "error": "missing_new_string"},
         )
 
-    no_of_occurrences = current_content.count(old_string)
+    # A single split both counts the occurrences and yields the pieces to re-join
+    parts = current_content.split(old_string)
+    no_of_occurrences = len(parts) - 1
     if no_of_occurrences == 0:
         preview = f"{old_string[:MAX_PREVIEW_LENGTH]}..." if len(old_string) > MAX_PREVIEW_LENGTH else old_string
         return ToolReturn(
@@ -154,7 +177,6 @@ async def edit_file(
             metadata={"success": False, "error": "no_match_string_found"},
         )
 
-    new_content = current_content.replace(old_string, new_string)
     if no_of_occurrences != expected_replacements:
         return ToolReturn(
             return_value=(
@@ -173,7 +195,8 @@ async def edit_file(
             },
         )
 
-    if not Path(file_path).exists():
+    new_content = new_string.join(parts)
+    if not path_obj.exists():
         if old_string:
             return ToolReturn(
                 return_value="File does not exist and old_string is not empty",
@@ -188,9 +211,8 @@ async def edit_file(
         new_content = old_string
 
     try:
-        diff_content = _generate_diff(current_content, new_content, Path(file_path))
         operation = "created" if is_new_file else "modified"
-        relative_path = Path(file_path).relative_to(workspace_path)
+        relative_path = path_obj.relative_to(workspace_path)
 
         edit_result = EditResult(
             file_path=str(file_path),
@@ -200,9 +222,7 @@ async def edit_file(
             is_new_file=is_new_file,
         )
 
-        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-        async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-            await f.write(new_content)
+        diff_content = await _write_and_diff(path_obj, current_content, new_content, no_of_occurrences)
 
         content_lines = [f"## File {operation.capitalize()}: {relative_path}"]
         if no_of_occurrences > 1:
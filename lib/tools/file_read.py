@@ -1,16 +1,22 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
+from stat import S_ISREG
 
-import aiofiles
 from attr import dataclass
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ToolReturn
 
 from lib.agents.context import AgentContext
 
+from .utils import count_lines
+
 logger = logging.getLogger(__name__)
 
+INLINE_READ_MAX_SIZE = 1024 * 1024  # Bytes; larger files are read in a worker thread to keep the event loop responsive
+
 
 @dataclass(frozen=True, slots=True)
 class FileInfo:
@@ -22,6 +28,33 @@ class FileInfo:
     lines_read: int
 
 
+def _read_lines(file_path: Path, encoding: str, start_idx: int, end_idx: int | None) -> tuple[str, int]:
+    """Read lines[start_idx:end_idx] of a file, streaming past the rest instead of loading every line.
+
+    Returns the selected content and the end index, which is the file's line count when end_idx is None.
+    """
+    with file_path.open(encoding=encoding) as f:
+        if start_idx < 0 or (end_idx is not None and end_idx < 0):
+            # Negative indices count from the end, which needs every line
+            lines = f.readlines()
+            return "".join(lines[start_idx:end_idx]), end_idx if end_idx is not None else len(lines)
+        skipped = sum(1 for _ in islice(f, start_idx))
+        selected = list(islice(f, None if end_idx is None else max(0, end_idx - start_idx)))
+        if end_idx is None:
+            end_idx = skipped + len(selected)
+    return "".join(selected), end_idx
+
+
+async def _read_lines_sized(
+    file_path: Path, size: int, encoding: str, start_idx: int, end_idx: int | None
+) -> tuple[str, int]:
+    """Run _read_lines inline for files of up to INLINE_READ_MAX_SIZE bytes, in a worker thread otherwise."""
+    if size <= INLINE_READ_MAX_SIZE:
+        # A worker-thread round trip costs more than reading a small file directly
+        return _read_lines(file_path, encoding, start_idx, end_idx)
+    return await asyncio.to_thread(_read_lines, file_path, encoding, start_idx, end_idx)
+
+
 async def read_file(
     ctx: RunContext[AgentContext],
     path: str,
@@ -44,32 +77,30 @@ async def read_file(
     logger.info(f"Reading file: {path} (encoding: {encoding}, lines: {start_line}-{end_line or 'end'})")
     file_path = Path(path).resolve()
 
-    if not file_path.exists():
+    # One stat answers both checks and is reused for the file info
+    try:
+        stat = file_path.stat()
+    except (OSError, ValueError):
         logger.warning(f"File not found: {path}")
         return ToolReturn(return_value=f"File not found: {path}", metadata={"success": False})
 
-    if not file_path.is_file():
+    if not S_ISREG(stat.st_mode):
         logger.warning(f"Path is not a file: {path}")
         return ToolReturn(return_value=f"Path is not a file: {path}", metadata={"success": False})
 
     workspace_path = ctx.deps.workspace_path
 
     try:
-        async with aiofiles.open(file_path, encoding=encoding) as f:
-            lines = await f.readlines()
-            start_idx = (start_line - 1) if start_line else 0
-            end_idx = end_line if end_line else len(lines)
-            selected_lines = lines[start_idx:end_idx]
-            content = "".join(selected_lines)
-            lines_info = f" (lines {start_idx + 1}-{end_idx})"
-            logger.debug(f"Read lines {start_idx + 1} to {end_idx} from file")
+        start_idx = (start_line - 1) if start_line else 0
+        content, end_idx = await _read_lines_sized(file_path, stat.st_size, encoding, start_idx, end_line or None)
+        lines_info = f" (lines {start_idx + 1}-{end_idx})"
+        logger.debug(f"Read lines {start_idx + 1} to {end_idx} from file")
 
-        stat = file_path.stat()
         file_info = FileInfo(
             path=str(file_path),
             size=stat.st_size,
             modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
-            lines_read=len(content.splitlines()) if content else 0,
+            lines_read=count_lines(content),
         )
 
         summary = f"Successfully read file: {path} {lines_info}"
@@ -9,6 +9,8 @@ from pydantic_ai.messages import ToolReturn
 
 from lib.agents.context import AgentContext
 
+from .utils import count_lines
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,13 +80,15 @@ async def write_file(
         temp_path.replace(file_path)
         logger.debug(f"Completed atomic move from {temp_path} to {file_path}")
 
+        lines_written = count_lines(content)
+
         # Get file info
         try:
             stat = file_path.stat()
             file_info = FileInfo(
                 path=str(file_path),
                 size=stat.st_size,
-                lines_written=len(content.splitlines()),
+                lines_written=lines_written,
                 created=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
             )
             logger.debug(f"File info: {file_info}")
@@ -93,13 +97,12 @@ async def write_file(
             file_info = FileInfo(
                 path=str(file_path),
                 size=-1,  # Unknown size
-                lines_written=len(content.splitlines()),
+                lines_written=lines_written,
                 created=datetime.now(timezone.utc).isoformat(),
             )
 
         # Build successful result
         chars_written = len(content)
-        lines_written = len(content.splitlines())
         bytes_written = file_info.size
 
         summary = f"Successfully wrote {chars_written} characters ({lines_written} lines) to {path}"
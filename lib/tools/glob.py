@@ -161,7 +161,7 @@ def _process_matches(matches: list[Path], root_directory: str, include_dirs: boo
     results = []
     for match_path in matches:
         # Skip if path should be ignored
-        if should_ignore_path(match_path, match_path.name):
+        if should_ignore_path(str(match_path), match_path.name):
             logger.debug(f"Ignoring path: {match_path}")
             continue
 
@@ -3,26 +3,49 @@ Grep tool for searching text patterns in files.
 """
 
 import asyncio
+import base64
+import contextlib
+import io
+import json
 import logging
+import multiprocessing
+import os
 import re
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Any
 
-import aiofiles
 from pydantic import BaseModel, Field
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ToolReturn
 
 from lib.agents.context import AgentContext
 
-from .utils import is_within_root, should_ignore_path
+from .utils import IGNORE_GLOBS, is_within_root, should_ignore_dir, should_ignore_path
 
 # Constants
 MAX_RESULTS_LIMIT = 1000
 DEFAULT_CONTEXT_LINES = 2
 DEFAULT_MAX_RESULTS = 100
 MAX_PREVIEW_LENGTH = 100
+MAX_GREP_FILE_SIZE = 10 * 1024 * 1024
+BINARY_SNIFF_SIZE = 8192  # Files with a NUL byte this early are treated as binary, as git and ripgrep do
+SEARCH_WORKERS = os.cpu_count() or 1
+PROCESS_POOL_MIN_FILES = 200
+_RIPGREP = shutil.which("rg")
+_RIPGREP_LINE_LIMIT = 16 * 1024 * 1024  # ripgrep emits one JSON record per line, which can be long for minified files
+_RIPGREP_IGNORE_ARGS = tuple(arg for glob in IGNORE_GLOBS for arg in ("--glob", f"!{glob}"))
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Assertions that look past the ends of a line, so a line can match alone but not within the whole buffer
+_LINE_CONTEXT_ASSERTIONS = ("\\A", "\\Z", "(?=", "(?!", "(?<")
+DIR_LISTING_CACHE_LIMIT = 10_000
+# Listings of directories modified this recently are not cached; coarse mtimes could hide a change made right after
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +80,7 @@ class FormatData:
     files_dict: dict[str, list[dict[str, Any]]]
     files_with_matches: int
     max_results: int
-    workspace_path: str
+    relative_paths: dict[str, str]
 
 
 @dataclass
@@ -92,43 +115,154 @@ class GrepError:
         )
 
 
-async def _search_file(file_path: Path, pattern: re.Pattern, context_lines: int) -> list[dict[str, Any]]:
+@lru_cache(maxsize=256)
+def _match_finder(pattern: re.Pattern) -> Callable[[str, int], int]:
+    """Return a function giving the offset of the first candidate match at or after pos, or -1.
+
+    Every line that matches on its own contains a candidate; candidates that only match across a
+    line break are rejected by the per-line check in _find_matches.
+    """
+    if any(assertion in pattern.pattern for assertion in _LINE_CONTEXT_ASSERTIONS):
+        # Such a pattern can match a line on its own but not inside the buffer, so every line is a candidate
+        return lambda content, pos: pos if pos < len(content) else -1
+
+    if not _REGEX_METACHARACTERS.intersection(pattern.pattern):
+        # Literal patterns go straight to str.find, which uses CPython's fastsearch instead of the regex engine
+        needle = pattern.pattern
+        return lambda content, pos: content.find(needle, pos)
+
+    search = pattern.search
+
+    def find(content: str, pos: int) -> int:
+        found = search(content, pos)
+        return -1 if found is None else found.start()
+
+    return find
+
+
+def _context_around(content: str, line_start: int, line_end: int, line_num: int, context_lines: int) -> list[str]:
+    """Format the line spanning content[line_start:line_end] with up to context_lines lines on either side."""
+    content_length = len(content)
+    context = []
+    start = line_start
+    while start > 0 and len(context) < context_lines:
+        previous_start = content.rfind("\n", 0, start - 1) + 1
+        context.append(f"    {line_num - len(context) - 1:4d}: {content[previous_start : start - 1]}")
+        start = previous_start
+    context.reverse()
+    context.append(f">>> {line_num:4d}: {content[line_start:line_end]}")
+    end = line_end
+    for i in range(1, context_lines + 1):
+        if end + 1 >= content_length:
+            break
+        next_end = content.find("\n", end + 1)
+        if next_end < 0:
+            next_end = content_length
+        context.append(f"    {line_num + i:4d}: {content[end + 1 : next_end]}")
+        end = next_end
+    return context
+
+
+def _find_matches(file_path: str, content: str, pattern: re.Pattern, context_lines: int) -> list[dict[str, Any]]:
+    """Find the lines of content matching pattern, with their surrounding context."""
+    # Scan the whole buffer in C; most files have no match and need no line splitting at all
+    find = _match_finder(pattern)
+    search = pattern.search
+    match_start = find(content, 0) if content else -1
+    if match_start < 0:
+        return []
+
+    # Newline searches locate each candidate line, so only it and its context are sliced out of content
+    content_length = len(content)
+    line_num = 1
+    counted_to = 0
+    matches = []
+
+    while match_start >= 0:
+        line_start = content.rfind("\n", 0, match_start) + 1
+        if line_start == content_length:
+            # A match after the final newline is not on any line
+            break
+        line_end = content.find("\n", match_start)
+        if line_end < 0:
+            line_end = content_length
+        line = content[line_start:line_end]
+        # A buffer hit can span a line break (e.g. `\s+bar`); only lines that match on their own are reported
+        if search(line) is not None:
+            line_num += content.count("\n", counted_to, line_start)
+            counted_to = line_start
+            matches.append(
+                {
+                    "file_path": file_path,
+                    "line_number": line_num,
+                    "line": line,
+                    "context": _context_around(content, line_start, line_end, line_num, context_lines),
+                }
+            )
+        # Report each line once: resume at the start of the next line
+        if line_end >= content_length:
+            break
+        match_start = find(content, line_end + 1)
+
+    return matches
+
+
+def _read_searchable(file_path: str) -> str | None:
+    """Read a file's text for searching, or return None for binary or oversized files."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MAX_GREP_FILE_SIZE:
+            return None
+        head = f.read(BINARY_SNIFF_SIZE)
+        if b"\0" in head:
+            return None
+        text = (head + f.read()).decode("utf-8", errors="ignore")
+    if "\r" in text:
+        # Translate newlines as a text-mode open() would, so `$` matches and lines carry no trailing \r
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+async def _search_file(file_path: str, pattern: re.Pattern, context_lines: int) -> list[dict[str, Any]]:
     """Search for pattern in a single file."""
     try:
-        async with aiofiles.open(file_path, encoding="utf-8", errors="ignore") as f:
-            content = await f.read()
-
-        lines = content.splitlines()
-        matches = []
-
-        for line_num, line in enumerate(lines, 1):
-            if pattern.search(line):
-                # Get context lines
-                start_line = max(0, line_num - 1 - context_lines)
-                end_line = min(len(lines), line_num + context_lines)
-
-                context = []
-                for i in range(start_line, end_line):
-                    prefix = ">>> " if i == line_num - 1 else "    "
-                    context.append(f"{prefix}{i + 1:4d}: {lines[i]}")
-
-                matches.append(
-                    {
-                        "file_path": str(file_path),
-                        "line_number": line_num,
-                        "line": line,
-                        "context": context,
-                    }
-                )
+        content = await asyncio.to_thread(_read_searchable, file_path)
+        if content is None:
+            return []
+        return _find_matches(file_path, content, pattern, context_lines)
+
+    except Exception as e:
+        logger.debug(f"Error searching file {file_path}: {e}")
+        return []
 
-        return matches
 
+def _search_file_sync(file_path: str, pattern: re.Pattern, context_lines: int) -> list[dict[str, Any]]:
+    """Search for pattern in a single file, blocking; used by the worker processes."""
+    try:
+        content = _read_searchable(file_path)
     except Exception as e:
         logger.debug(f"Error searching file {file_path}: {e}")
         return []
+    return _find_matches(file_path, content, pattern, context_lines) if content is not None else []
+
+
+def _search_files_sync(
+    file_paths: list[str], pattern: str, flags: int, context_lines: int
+) -> list[list[dict[str, Any]]]:
+    """Search a chunk of files in a worker process; _compile's cache compiles the pattern once per worker."""
+    regex = _compile(pattern, flags)
+    return [_search_file_sync(file_path, regex, context_lines) for file_path in file_paths]
+
+
+@cache
+def _search_pool() -> ProcessPoolExecutor:
+    """Worker processes for CPU-bound regex matching, started on first large search."""
+    # Forking this process, which already runs asyncio's worker threads, can deadlock on a lock one of them holds;
+    # forkserver starts workers from a clean single-threaded process instead (spawn where it is unavailable)
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=SEARCH_WORKERS, mp_context=multiprocessing.get_context(method))
 
 
-def _get_files_by_pattern(search_path: Path, include_pattern: str) -> list[Path]:
+def _get_files_by_pattern(search_path: Path, include_pattern: str) -> list[str]:
     """Find files matching a glob pattern."""
     # If the include pattern is a full path, use it as is
     if Path(include_pattern).is_absolute():
@@ -136,39 +270,87 @@ def _get_files_by_pattern(search_path: Path, include_pattern: str) -> list[Path]
         if (
             is_within_root(path_obj, search_path)
             and path_obj.is_file()
-            and not should_ignore_path(path_obj, path_obj.name)
+            and not should_ignore_path(str(path_obj), path_obj.name)
         ):
-            return [path_obj]
+            return [str(path_obj)]
         return []
 
     # Try direct glob
     pattern_matches = list(search_path.glob(include_pattern))
-    result_files = [path for path in pattern_matches if path.is_file() and not should_ignore_path(path, path.name)]
+    result_files = [
+        path_str
+        for path in pattern_matches
+        if path.is_file() and not should_ignore_path(path_str := str(path), path.name)
+    ]
 
     # Try recursive glob if no files found and not already recursive
     if not result_files and "**" not in include_pattern:
         recursive_matches = list(search_path.glob(f"**/{include_pattern}"))
         result_files = [
-            path for path in recursive_matches if path.is_file() and not should_ignore_path(path, path.name)
+            path_str
+            for path in recursive_matches
+            if path.is_file() and not should_ignore_path(path_str := str(path), path.name)
         ]
 
     return result_files
 
 
-def _get_all_files(search_path: Path) -> list[Path]:
+@lru_cache(maxsize=512)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    """Compile a regex once per (pattern, flags) across grep invocations."""
+    return re.compile(pattern, flags)
+
+
+# Per-directory (mtime_ns, files, subdirectories); adding, removing or renaming an entry updates the mtime
+_dir_listing_cache: dict[str, tuple[int, tuple[str, ...], tuple[str, ...]]] = {}
+
+
+def _list_dir(path: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Return the searchable files and the subdirectories of a directory, reusing the listing while unchanged."""
+    # Paths stay plain strings on this per-directory hot path; a Path object per directory would be pure overhead
+    mtime = os.stat(path).st_mtime_ns  # noqa: PTH116
+    cached = _dir_listing_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    files: list[str] = []
+    subdirs: list[str] = []
+    # Ignore patterns never span a path separator, so once the directory itself passes only entry names are checked
+    if not should_ignore_dir(path):
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not should_ignore_dir(entry.name):
+                        subdirs.append(entry.path)
+                elif entry.is_file() and not should_ignore_path(entry.name, entry.name):
+                    files.append(entry.path)
+    listing = (tuple(files), tuple(subdirs))
+    if time.time_ns() - mtime > _RACY_MTIME_WINDOW_NS:
+        if len(_dir_listing_cache) >= DIR_LISTING_CACHE_LIMIT:
+            _dir_listing_cache.clear()
+        _dir_listing_cache[path] = (mtime, *listing)
+    return listing
+
+
+def _get_all_files(search_path: Path) -> list[str]:
     """Get all files recursively from a directory."""
+    files: list[str] = []
+    pending = [str(search_path)]
     try:
-        return [
-            file_path
-            for file_path in search_path.rglob("*")
-            if file_path.is_file() and not should_ignore_path(file_path, file_path.name)
-        ]
+        while pending:
+            try:
+                dir_files, subdirs = _list_dir(pending.pop())
+            except OSError:
+                continue
+            files.extend(dir_files)
+            pending.extend(subdirs)
     except Exception as e:
         logger.warning(f"Error traversing directory {search_path}: {e}")
         return []
+    return files
 
 
-def _get_files_to_search(search_path: Path, include_pattern: str | None = None) -> list[Path]:
+def _get_files_to_search(search_path: Path, include_pattern: str | None = None) -> list[str]:
     """Get list of files to search based on include pattern."""
     if not include_pattern:
         # Search all files recursively
@@ -183,7 +365,7 @@ def _get_files_to_search(search_path: Path, include_pattern: str | None = None)
 
 
 async def _process_search_results(
-    files_to_search: list[Path], regex: re.Pattern, context_lines: int, max_results: int
+    files_to_search: list[str], regex: re.Pattern, context_lines: int, max_results: int
 ) -> dict[str, Any]:
     """Process search results in batches.
 
@@ -193,12 +375,31 @@ async def _process_search_results(
     all_matches = []
     files_with_matches = 0
 
+    # Large searches spread the regex work over worker processes; the GIL serialises it in this one
+    use_pool = len(files_to_search) >= PROCESS_POOL_MIN_FILES
+    loop = asyncio.get_running_loop()
+
     # Process files in batches to avoid overwhelming the system
-    batch_size = 50
+    batch_size = SEARCH_WORKERS * 32 if use_pool else 50
     for i in range(0, len(files_to_search), batch_size):
         batch = files_to_search[i : i + batch_size]
-        search_tasks = [_search_file(file_path, regex, context_lines) for file_path in batch]
-        batch_results = await asyncio.gather(*search_tasks)
+        if use_pool:
+            chunk_size = -(-len(batch) // SEARCH_WORKERS)
+            chunk_tasks = [
+                loop.run_in_executor(
+                    _search_pool(),
+                    _search_files_sync,
+                    batch[j : j + chunk_size],
+                    regex.pattern,
+                    regex.flags,
+                    context_lines,
+                )
+                for j in range(0, len(batch), chunk_size)
+            ]
+            batch_results = [matches for chunk in await asyncio.gather(*chunk_tasks) for matches in chunk]
+        else:
+            search_tasks = [_search_file(file_path, regex, context_lines) for file_path in batch]
+            batch_results = await asyncio.gather(*search_tasks)
 
         for matches in batch_results:
             if matches:
@@ -216,6 +417,140 @@ async def _process_search_results(
     return {"all_matches": all_matches, "files_with_matches": files_with_matches}
 
 
+def _ripgrep_text(field: dict[str, Any]) -> str:
+    """Decode a ripgrep JSON text field, which falls back to base64 bytes for non-UTF-8 data."""
+    if "text" in field:
+        return field["text"]
+    return base64.b64decode(field["bytes"]).decode("utf-8", errors="ignore")
+
+
+def _ripgrep_file_matches(file_path: str, lines: dict[int, str], match_lines: list[int], context_lines: int) -> list:
+    """Build match dicts for one file from the match and context lines ripgrep reported."""
+    matches = []
+    for line_num in match_lines:
+        context = [
+            f"{'>>> ' if i == line_num else '    '}{i:4d}: {lines[i]}"
+            for i in range(line_num - context_lines, line_num + context_lines + 1)
+            if i in lines
+        ]
+        matches.append({"file_path": file_path, "line_number": line_num, "line": lines[line_num], "context": context})
+    return matches
+
+
+async def _read_ripgrep_output(
+    stdout: asyncio.StreamReader, context_lines: int, max_results: int
+) -> tuple[dict[str, Any], bool]:
+    """Collect the matches from ripgrep's JSON output, stopping early once max_results are found.
+
+    Returns:
+        tuple with (results, limited), results in the shape returned by _grep_ripgrep
+    """
+    all_matches: list[dict[str, Any]] = []
+    files_with_matches = 0
+    files_searched = None
+    lines: dict[int, str] = {}
+    match_lines: list[int] = []
+    limited = False
+    async for raw in stdout:
+        record = json.loads(raw)
+        kind, data = record["type"], record["data"]
+        if kind in ("match", "context"):
+            line_num = data["line_number"]
+            lines[line_num] = _ripgrep_text(data["lines"]).removesuffix("\n").removesuffix("\r")
+            if kind == "match":
+                match_lines.append(line_num)
+        elif kind == "end":
+            if match_lines:
+                file_path = _ripgrep_text(data["path"])
+                all_matches.extend(_ripgrep_file_matches(file_path, lines, match_lines, context_lines))
+                files_with_matches += 1
+            lines, match_lines = {}, []
+            if len(all_matches) >= max_results:
+                all_matches = all_matches[:max_results]
+                limited = True
+                break
+        elif kind == "summary":
+            files_searched = data["stats"]["searches"]
+    results = {
+        "all_matches": all_matches,
+        "files_with_matches": files_with_matches,
+        "files_searched": files_with_matches if files_searched is None else files_searched,
+    }
+    return results, limited
+
+
+async def _grep_ripgrep(
+    pattern: str, search_path: Path, include: str | None, context_lines: int, max_results: int
+) -> dict[str, Any] | None:
+    """Search with ripgrep, returning None when it is unavailable or fails so the caller can fall back.
+
+    Returns:
+        dict with search results, in the shape of _process_search_results plus files_searched
+    """
+    if _RIPGREP is None or (include and Path(include).is_absolute()):
+        return None
+
+    context_lines = max(0, context_lines)
+    # Search hidden and git-ignored files too, and skip only what the Python search skips, so both agree;
+    # --no-config keeps a user's RIPGREP_CONFIG_PATH flags from changing the results
+    args = [_RIPGREP, "--json", "--no-config", "--no-messages", "--hidden", "--no-ignore", "-C", str(context_lines)]
+    args += ["-e", pattern]
+    # Let `$` match before \r\n too, as it does in the Python search after newline translation
+    args.append("--crlf")
+    # Like _read_searchable, skip only files strictly larger than the limit
+    args += ["--max-filesize", str(MAX_GREP_FILE_SIZE)]
+    if include:
+        args += ["--glob", include]
+    # Later globs win in ripgrep, so the exclusions come after the include glob
+    args += [*_RIPGREP_IGNORE_ARGS, "--", str(search_path)]
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL, limit=_RIPGREP_LINE_LIMIT
+        )
+    except OSError as e:
+        logger.debug(f"Could not start ripgrep: {e}")
+        return None
+
+    limited = False
+    drained = False
+    try:
+        stdout: asyncio.StreamReader = process.stdout  # type: ignore[assignment]
+        results, limited = await _read_ripgrep_output(stdout, context_lines, max_results)
+        drained = not limited
+    except (ValueError, KeyError) as e:
+        logger.debug(f"Could not parse ripgrep output: {e}")
+        return None
+    finally:
+        # Stop ripgrep once enough matches were read or its output could not be parsed
+        if not drained and process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+        await process.wait()
+
+    # Exit status 2 means an error, e.g. a pattern ripgrep's regex engine rejects
+    if not limited and process.returncode not in (0, 1):
+        return None
+    return results
+
+
+async def _grep_python(
+    regex: re.Pattern, search_path: Path, include: str | None, context_lines: int, max_results: int
+) -> dict[str, Any]:
+    """Search with the Python implementation, used when ripgrep is unavailable or fails.
+
+    Returns:
+        dict with search results, in the shape returned by _grep_ripgrep
+    """
+    files_to_search = _get_files_to_search(search_path, include)
+    if not files_to_search:
+        return {"all_matches": [], "files_with_matches": 0, "files_searched": 0}
+
+    results = await _process_search_results(files_to_search, regex, context_lines, max_results)
+    results["files_searched"] = len(files_to_search)
+    return results
+
+
 def _format_no_results(pattern: str, search_path: Path, include: str | None, files_searched: int) -> ToolReturn:
     """Format response when no results are found."""
     if files_searched == 0:
@@ -239,11 +574,11 @@ def _format_no_results(pattern: str, search_path: Path, include: str | None, fil
 
 def _prepare_structured_matches(
     all_matches: list[dict[str, Any]], workspace_path: str
-) -> tuple[list[GrepMatch], dict[str, list[dict[str, Any]]]]:
+) -> tuple[list[GrepMatch], dict[str, list[dict[str, Any]]], dict[str, str]]:
     """Convert matches to structured format and group by file.
 
     Returns:
-        tuple with (structured_matches, files_dict)
+        tuple with (structured_matches, files_dict, relative_paths), relative_paths giving each file's display path
     """
     # Group matches by file
     files_dict = {}
@@ -254,21 +589,29 @@ def _prepare_structured_matches(
         files_dict[file_path].append(match)
 
     # Convert to structured matches with relative paths
-    root_directory = Path(workspace_path).resolve()
+    # Paths found under the workspace start with its resolved path; slicing them avoids a Path per file
+    root = os.path.realpath(workspace_path)
+    root_prefix = root if root.endswith(os.sep) else root + os.sep
     structured_matches = []
+    relative_paths = {}
 
     for file_path, matches in files_dict.items():
-        path_obj = Path(file_path)
-        try:
-            relative_path = path_obj.relative_to(root_directory)
-        except ValueError:
-            relative_path = path_obj
+        if file_path.startswith(root_prefix):
+            relative_path = file_path[len(root_prefix) :]
+        else:
+            path_obj = Path(file_path)
+            try:
+                relative_path = str(path_obj.relative_to(root_prefix))
+            except ValueError:
+                relative_path = str(path_obj)
+        relative_paths[file_path] = relative_path
 
+        # The values were built here, so pydantic's per-field validation is skipped
         structured_matches.extend(
             [
-                GrepMatch(
+                GrepMatch.model_construct(
                     file_path=file_path,
-                    relative_path=str(relative_path),
+                    relative_path=relative_path,
                     line_number=match["line_number"],
                     line=match["line"],
                     context_lines=match["context"],
@@ -277,46 +620,35 @@ def _prepare_structured_matches(
             ]
         )
 
-    return structured_matches, files_dict
+    return structured_matches, files_dict, relative_paths
 
 
-def _format_content_lines(data: FormatData) -> list[str]:
-    """Format content lines for the output.
+def _format_content(data: FormatData) -> str:
+    """Format the markdown content for the output.
 
     Returns:
-        list of content lines
+        the content, written into one buffer instead of joined from a list of lines
     """
-    content_lines = [
-        f"## Search Results: `{data.pattern}`",
-        "",
-        f"Found {len(data.all_matches)} match(es) in {data.files_with_matches} file(s)",
-    ]
+    buffer = io.StringIO()
+    write = buffer.write
+    write(f"## Search Results: `{data.pattern}`\n\n")
+    write(f"Found {len(data.all_matches)} match(es) in {data.files_with_matches} file(s)\n")
 
     if len(data.all_matches) >= data.max_results:
-        content_lines.append(f"_Results limited to {data.max_results} matches_")
-
-    content_lines.append("")
+        write(f"_Results limited to {data.max_results} matches_\n")
 
     # Group results by file for readability
-    root_directory = Path(data.workspace_path).resolve()
     for file_path, matches in data.files_dict.items():
-        path_obj = Path(file_path)
-        try:
-            relative_path = path_obj.relative_to(root_directory)
-        except ValueError:
-            relative_path = path_obj
-
-        content_lines.append(f"### `{relative_path}`")
-        content_lines.append("")
+        write(f"\n### `{data.relative_paths[file_path]}`\n")
 
         for match in matches:
-            content_lines.append(f"**Line {match['line_number']}**:")
-            content_lines.append("```")
-            content_lines.extend(match["context"])
-            content_lines.append("```")
-            content_lines.append("")
+            write(f"\n**Line {match['line_number']}**:\n```\n")
+            for context_line in match["context"]:
+                write(context_line)
+                write("\n")
+            write("```\n")
 
-    return content_lines
+    return buffer.getvalue()
 
 
 async def grep(
@@ -384,27 +716,24 @@ async def grep(
 
         # Compile regex pattern
         try:
-            regex = re.compile(params.pattern, re.MULTILINE)
+            regex = _compile(params.pattern, re.MULTILINE)
         except re.error as e:
             return GrepError(error_msg=f"Invalid regular expression: {e}", error_code="invalid_regex").to_tool_return()
 
-        # Get files to search
-        files_to_search = _get_files_to_search(search_path, params.include)
-
-        if not files_to_search:
-            return _format_no_results(params.pattern, search_path, params.include, 0)
-
-        # Search files
-        results = await _process_search_results(files_to_search, regex, params.context_lines, max_results)
+        # Prefer ripgrep when installed; fall back to the Python search when it is missing or fails
+        results = await _grep_ripgrep(params.pattern, search_path, params.include, params.context_lines, max_results)
+        if results is None:
+            results = await _grep_python(regex, search_path, params.include, params.context_lines, max_results)
         all_matches = results["all_matches"]
         files_with_matches = results["files_with_matches"]
+        files_searched = results["files_searched"]
 
         # Format results
         if not all_matches:
-            return _format_no_results(params.pattern, search_path, params.include, len(files_to_search))
+            return _format_no_results(params.pattern, search_path, params.include, files_searched)
 
         # Convert to structured matches and group by file
-        structured_matches, files_dict = _prepare_structured_matches(all_matches, workspace_path)
+        structured_matches, files_dict, relative_paths = _prepare_structured_matches(all_matches, workspace_path)
 
         # Generate readable output
         format_data = FormatData(
@@ -413,14 +742,14 @@ async def grep(
             files_dict=files_dict,
             files_with_matches=files_with_matches,
             max_results=max_results,
-            workspace_path=workspace_path,
+            relative_paths=relative_paths,
         )
-        content_lines = _format_content_lines(format_data)
+        content = _format_content(format_data)
 
         # Create result model
-        result = GrepResult(
+        result = GrepResult.model_construct(
             pattern=params.pattern,
-            files_searched=len(files_to_search),
+            files_searched=files_searched,
             files_with_matches=files_with_matches,
             matches_found=len(all_matches),
             results_limited=len(all_matches) >= max_results,
@@ -429,13 +758,13 @@ async def grep(
 
         return ToolReturn(
             return_value=result.model_dump(),
-            content="\n".join(content_lines),
+            content=content,
             metadata={
                 "success": True,
                 "pattern": params.pattern,
                 "search_path": str(search_path),
                 "include_pattern": params.include,
-                "files_searched": len(files_to_search),
+                "files_searched": files_searched,
                 "files_with_matches": files_with_matches,
                 "matches_found": len(all_matches),
                 "results_limited": len(all_matches) >= max_results,
@@ -1,10 +1,11 @@
-import json
+import asyncio
 import logging
+import re
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
-import aiofiles
 from pydantic import BaseModel, Field
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ToolReturn
@@ -18,6 +19,22 @@ logger = logging.getLogger(__name__)
 CONFIG_DIR = ".memories"
 DEFAULT_MEMORY_FILENAME = "memories.md"
 MEMORY_SECTION_HEADER = "## Added Memories"
+# A "- " bullet line; the captured text excludes surrounding whitespace and empty bullets are skipped
+_MEMORY_ITEM_RE = re.compile(r"^[^\S\n]*- (.*\S)[^\S\n]*$", re.MULTILINE)
+
+
+@dataclass(frozen=True, slots=True)
+class _MemoryFileState:
+    """What a read of the memory file learned, valid while its (mtime_ns, size) is unchanged."""
+
+    version: tuple[int, int]
+    memories: list[str]
+    # Text to write before a new entry when the memory section ends the file, or None if entries cannot be appended
+    append_prefix: str | None
+
+
+# Per memory file, so unchanged files are neither re-read nor rewritten to add an entry
+_memories_cache: dict[Path, _MemoryFileState] = {}
 
 
 class MemoryOutput(BaseModel):
@@ -38,8 +55,8 @@ class Memory(BaseModel):
     source: str = Field(default="user", description="Source of the memory")
 
 
-async def _get_memory_file_path() -> Path:
-    """Get the path to the memory file."""
+def _ensure_memory_file() -> Path:
+    """Get the path to the memory file, creating it if needed."""
     home_dir = Path.home()
     memory_dir = home_dir / CONFIG_DIR
     memory_file = memory_dir / DEFAULT_MEMORY_FILENAME
@@ -49,41 +66,89 @@ async def _get_memory_file_path() -> Path:
 
     # Create file if it doesn't exist
     if not memory_file.exists():
-        async with aiofiles.open(memory_file, "w", encoding="utf-8") as f:
-            await f.write(f"{MEMORY_SECTION_HEADER}\n\n")
+        memory_file.write_text(f"{MEMORY_SECTION_HEADER}\n\n", encoding="utf-8")
 
     return memory_file
 
 
-async def _read_memories() -> List[str]:
-    """Read all stored memories."""
-    memory_file = await _get_memory_file_path()
+async def _get_memory_file_path() -> Path:
+    """Get the path to the memory file."""
+    return await asyncio.to_thread(_ensure_memory_file)
 
-    try:
-        async with aiofiles.open(memory_file, "r", encoding="utf-8") as f:
-            content = await f.read()
 
-        # Find the memories section
+def _load_memories(memory_file: Path) -> List[str]:
+    stat = memory_file.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _memories_cache.get(memory_file)
+    if cached is not None and cached.version == version:
+        return list(cached.memories)
+
+    content = memory_file.read_text(encoding="utf-8")
+
+    # Find the memories section
+    header_index = content.find(MEMORY_SECTION_HEADER)
+    if header_index == -1:
+        return []
+
+    # Extract memories
+    section_start = header_index + len(MEMORY_SECTION_HEADER)
+    section_end = content.find("\n## ", section_start)
+    append_prefix = None
+    if section_end == -1:
+        section_end = len(content)
+        append_prefix = "" if content.endswith("\n") else "\n"
+
+    # Parse memory items
+    memories = _MEMORY_ITEM_RE.findall(content, section_start, section_end)
+    _memories_cache[memory_file] = _MemoryFileState(version, memories, append_prefix)
+    return list(memories)
+
+
+def _append_memory(memory_file: Path, fact: str) -> None:
+    # When the file is unchanged since it was last read and ends with the memory section, just append
+    stat = memory_file.stat()
+    cached = _memories_cache.pop(memory_file, None)
+    if cached is not None and cached.version == (stat.st_mtime_ns, stat.st_size) and cached.append_prefix is not None:
+        with memory_file.open("a", encoding="utf-8") as f:
+            f.write(f"{cached.append_prefix}- {fact}\n")
+        return
+
+    # Read existing content
+    content = memory_file.read_text(encoding="utf-8")
+
+    # Find or create the memories section
+    header_index = content.find(MEMORY_SECTION_HEADER)
+    if header_index == -1:
+        content += f"\n{MEMORY_SECTION_HEADER}\n"
         header_index = content.find(MEMORY_SECTION_HEADER)
-        if header_index == -1:
-            return []
 
-        # Extract memories
-        section_start = header_index + len(MEMORY_SECTION_HEADER)
-        section_end = content.find("\n## ", section_start)
-        if section_end == -1:
-            section_end = len(content)
+    # Format memory entry
+    memory_entry = f"- {fact}"
 
-        memory_section = content[section_start:section_end].strip()
+    # Insert at appropriate position
+    section_start = header_index + len(MEMORY_SECTION_HEADER)
+    section_end = content.find("\n## ", section_start)
+    if section_end == -1:
+        section_end = len(content)
 
-        # Parse memory items
-        memories = []
-        for line_text in memory_section.split("\n"):
-            cleaned_line = line_text.strip()
-            if cleaned_line.startswith("- "):
-                memories.append(cleaned_line[2:])
+    before_section = content[:section_start]
+    section_content = content[section_start:section_end].strip()
+    after_section = content[section_end:]
 
-        return memories
+    # Add memory to section content
+    section_content = f"{section_content}\n{memory_entry}" if section_content else memory_entry
+
+    # Rebuild content and write back
+    memory_file.write_text(f"{before_section}\n{section_content}\n{after_section}", encoding="utf-8")
+
+
+# Each operation runs as one blocking call in a worker thread instead of a thread hop per aiofiles call
+async def _read_memories() -> List[str]:
+    """Read all stored memories."""
+    memory_file = await _get_memory_file_path()
+
+    try:
+        return await asyncio.to_thread(_load_memories, memory_file)
     except Exception as e:
         logger.error(f"Error reading memories: {e}")
         return []
@@ -94,39 +159,7 @@ async def _store_memory(memory: Memory) -> bool:
     memory_file = await _get_memory_file_path()
 
     try:
-        # Read existing content
-        async with aiofiles.open(memory_file, "r", encoding="utf-8") as f:
-            content = await f.read()
-
-        # Find or create the memories section
-        header_index = content.find(MEMORY_SECTION_HEADER)
-        if header_index == -1:
-            content += f"\n{MEMORY_SECTION_HEADER}\n"
-            header_index = content.find(MEMORY_SECTION_HEADER)
-
-        # Format memory entry
-        memory_entry = f"- {memory.fact}"
-
-        # Insert at appropriate position
-        section_start = header_index + len(MEMORY_SECTION_HEADER)
-        section_end = content.find("\n## ", section_start)
-        if section_end == -1:
-            section_end = len(content)
-
-        before_section = content[:section_start]
-        section_content = content[section_start:section_end].strip()
-        after_section = content[section_end:]
-
-        # Add memory to section content
-        section_content = f"{section_content}\n{memory_entry}" if section_content else memory_entry
-
-        # Rebuild content
-        new_content = f"{before_section}\n{section_content}\n{after_section}"
-
-        # Write back
-        async with aiofiles.open(memory_file, "w", encoding="utf-8") as f:
-            await f.write(new_content)
-
+        await asyncio.to_thread(_append_memory, memory_file, memory.fact)
         return True
     except Exception as e:
         logger.error(f"Error storing memory: {e}")
@@ -158,7 +191,7 @@ async def save_memory(
         if not classifier_result.should_remember:
             message = f"I've decided not to remember this because: {classifier_result.reason}"
             output = MemoryOutput(success=True, message=message, memories=existing_memories)
-            return ToolReturn(return_value=message, content=json.dumps(output.model_dump()))
+            return ToolReturn(return_value=message, content=output.model_dump_json())
 
         # Use summarizer to process the memory
         summarizer_result = await summarize_memory(existing_memories, fact)
@@ -175,17 +208,17 @@ async def save_memory(
                 message=message,
                 memories=await _read_memories(),  # Get updated list
             )
-            return ToolReturn(return_value=message, content=json.dumps(output.model_dump()))
+            return ToolReturn(return_value=message, content=output.model_dump_json())
 
         message = "I couldn't save that to my memory due to a technical issue."
         output = MemoryOutput(success=False, message=message, memories=existing_memories)
-        return ToolReturn(return_value=message, content=json.dumps(output.model_dump()))
+        return ToolReturn(return_value=message, content=output.model_dump_json())
 
     except Exception as e:
         logger.error(f"Error in save_memory: {e}")
         error_msg = f"Error saving memory: {e!s}"
         output = MemoryOutput(success=False, message=error_msg, memories=[])
-        return ToolReturn(return_value=error_msg, content=json.dumps(output.model_dump()))
+        return ToolReturn(return_value=error_msg, content=output.model_dump_json())
 
 
 async def retrieve_memories(
@@ -209,9 +242,9 @@ async def retrieve_memories(
 
         output = MemoryOutput(success=True, message="Successfully retrieved memories", memories=memories)
 
-        return ToolReturn(return_value="Successfully retrieved memories", content=json.dumps(output.model_dump()))
+        return ToolReturn(return_value="Successfully retrieved memories", content=output.model_dump_json())
 
     except Exception as e:
         logger.error(f"Error in retrieve_memories: {e}")
         output = MemoryOutput(success=False, message=f"Error retrieving memories: {e!s}", memories=[])
-        return ToolReturn(return_value=f"Error retrieving memories: {e!s}", content=json.dumps(output.model_dump()))
+        return ToolReturn(return_value=f"Error retrieving memories: {e!s}", content=output.model_dump_json())
@@ -1,54 +1,80 @@
-from fnmatch import fnmatch
+import os
+import re
 from pathlib import Path
 
 import aiofiles
 
+_IGNORE_LITERALS = (
+    "__pycache__",
+    ".git",
+    ".svn",
+    ".hg",
+    "node_modules",
+    ".DS_Store",
+    ".env",
+)
+_IGNORE_SUFFIXES = (
+    ".pyc",
+    ".pyo",
+    ".pyd",
+    ".so",
+    ".dll",
+    ".exe",
+    ".bin",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".pdf",
+    ".zip",
+    ".tar",
+    ".gz",
+)
+# The same rules as globs, for tools such as ripgrep; as in should_ignore_path, a literal matches anywhere in a name
+IGNORE_GLOBS = (*(f"*{literal}*" for literal in _IGNORE_LITERALS), *(f"*{suffix}" for suffix in _IGNORE_SUFFIXES))
+_IGNORE_LITERALS_SEARCH = re.compile("|".join(re.escape(literal) for literal in _IGNORE_LITERALS)).search
 
-def should_ignore_path(path: Path, name: str) -> bool:
+
+def should_ignore_path(path_str: str, name: str) -> bool:
     """Check if a path should be ignored based on common patterns."""
-    ignore_patterns = [
-        "__pycache__",
-        ".git",
-        ".svn",
-        ".hg",
-        "node_modules",
-        ".DS_Store",
-        ".env",
-        "*.pyc",
-        "*.pyo",
-        "*.pyd",
-        "*.so",
-        "*.dll",
-        "*.exe",
-        "*.bin",
-        "*.jpg",
-        "*.jpeg",
-        "*.png",
-        "*.gif",
-        "*.pdf",
-        "*.zip",
-        "*.tar",
-        "*.gz",
-    ]
-
-    path_str = str(path)
-
-    for pattern in ignore_patterns:
-        if pattern.startswith("*."):
-            if fnmatch.fnmatch(name, pattern):
-                return True
-        elif pattern in path_str:
+    if name.endswith(_IGNORE_SUFFIXES):
+        return True
+
+    return _IGNORE_LITERALS_SEARCH(path_str) is not None
+
+
+def should_ignore_dir(path_str: str) -> bool:
+    """Check if every path below a directory would be ignored, so the walk can skip it."""
+    return _IGNORE_LITERALS_SEARCH(path_str) is not None
+
+
+def is_within_root(path: Path | str, root: Path | str, follow_symlinks: bool = False) -> bool:
+    """
+    Check if a path is located inside root.
+
+    The comparison is lexical (no filesystem access) unless follow_symlinks is set,
+    in which case both paths are resolved first.
+    """
+    if follow_symlinks:
+        try:
+            Path(path).resolve().relative_to(Path(root).resolve())
             return True
+        except ValueError:
+            return False
 
-    return False
+    root_str = os.path.normpath(root)
+    path_str = os.path.normpath(path)
+    # A separator-terminated prefix check avoids commonpath splitting both paths into parts
+    return path_str == root_str or path_str.startswith(root_str if root_str.endswith(os.sep) else root_str + os.sep)
 
 
-def is_within_root(path: Path, root: Path) -> bool:
-    try:
-        path.resolve().relative_to(root)
-        return True
-    except ValueError:
-        return False
+def count_lines(text: str) -> int:
+    """Count the "\\n"-separated lines of text, a final line without "\\n" included.
+
+    This deliberately differs from len(text.splitlines()), which also breaks lines at characters such as form
+    feeds, "\\x0b", "\\x1c"-"\\x1e", "\\x85", "\\u2028" and "\\u2029".
+    """
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
 
 
 async def read_file_content(path: Path) -> tuple[str | None, Exception | None]:
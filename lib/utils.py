@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -15,22 +16,36 @@ def is_git_repository(path: str | Path) -> bool:
     return git_dir.exists() and (git_dir.is_dir() or git_dir.is_file())
 
 
-PYTHON_FILES = ["requirements.txt", "pyproject.toml", "setup.py", "Pipfile", "environment.yml", "conda.yml"]
+PYTHON_FILES: frozenset[str] = frozenset(
+    {"requirements.txt", "pyproject.toml", "setup.py", "Pipfile", "environment.yml", "conda.yml"}
+)
+NODE_FILES: frozenset[str] = frozenset({"package.json", "package-lock.json", "yarn.lock"})
+
+
+def _has_any_entry(workspace_path: Path | str, names: frozenset[str]) -> bool:
+    """
+    Check if the top level of the workspace contains an entry with one of the given names.
+    The directory is read once instead of probing every candidate file separately.
+    """
+    try:
+        with os.scandir(workspace_path) as entries:
+            return any(entry.name in names for entry in entries)
+    except OSError:
+        return False
 
 
 def has_python_files(workspace_path: Path | str) -> bool:
     """
     Check if the given workspace path contains any Python files.
     """
-    return any(Path(workspace_path, file).exists() for file in PYTHON_FILES)
+    return _has_any_entry(workspace_path, PYTHON_FILES)
 
 
 def has_node_files(workspace_path: Path | str) -> bool:
     """
     Check if the given workspace path contains any Node.js files.
     """
-    node_files = ["package.json", "package-lock.json", "yarn.lock"]
-    return any(Path(workspace_path, file).exists() for file in node_files)
+    return _has_any_entry(workspace_path, NODE_FILES)
 
 
 def is_valid_workspace(workspace_path: Path | str) -> bool:
@@ -1,26 +1,38 @@
 # ruff: noqa: T201 PLC0415
 import asyncio
+import hashlib
+import json
 import time
+from collections.abc import Callable
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from lib.event_sys import EventBus
 
-async def run_agent(workspace_path: str, task_str: str | None) -> None:
-    from lib import AgentContext, ModelConfig, build_primary_agent, get_event_bus
+
+def _create_context(workspace_path: str) -> Any:
+    from lib import AgentContext, get_event_bus
 
     if not Path(workspace_path).is_dir():
         raise ValueError("The provided workspace path should be a directory, not a file.")
 
-    # Get the event bus
-    event_bus = get_event_bus()
+    # Create the context with the shared event bus
+    return AgentContext(workspace_path=workspace_path, event_bus=get_event_bus())
+
 
-    # Create the context with the event bus
-    context = AgentContext(workspace_path=workspace_path, event_bus=event_bus)
+async def run_agent(workspace_path: str, task_str: str | None) -> None:
+    from lib import get_agent
+
+    context = _create_context(workspace_path)
 
-    agent = build_primary_agent(ModelConfig())
+    agent = get_agent()
+    loop = asyncio.get_running_loop()
 
     while True:
         while not task_str:
-            task_str = input("Enter your task or type quit/exit to terminate: > ")
+            # Read on a worker thread so event bus deliveries keep running while waiting for the user
+            task_str = await loop.run_in_executor(None, input, "Enter your task or type quit/exit to terminate: > ")
             if task_str.strip():
                 break
             print("Task cannot be empty. Please enter a valid task or type quit/exit to terminate: > ")
@@ -33,26 +45,98 @@ async def run_agent(workspace_path: str, task_str: str | None) -> None:
         task_str = None
 
 
-def run_ui() -> None:
-    """Main entry point for the UI"""
-    # Create an instance of the EventBus
+def _task_key(workspace_path: str, task_str: str) -> str:
+    return hashlib.sha256((workspace_path + task_str).encode()).hexdigest()
+
+
+def _record_key(line: str) -> str | None:
+    try:
+        return json.loads(line)["key"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _load_done_keys(results_path: Path) -> set[str]:
+    """Keys of the tasks already recorded in the results file; a torn last line is ignored"""
+    try:
+        with results_path.open(encoding="utf-8") as f:
+            return {key for line in f if (key := _record_key(line)) is not None}
+    except FileNotFoundError:
+        return set()
+
+
+def _append_result(results_path: Path, record: dict[str, Any]) -> None:
+    with results_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+async def run_tasks(workspace_path: str, tasks: list[str], results_path: str = "results.jsonl") -> None:
+    """
+    Run a batch of tasks, recording each output in a JSONL checkpoint file.
+    Tasks already recorded for this workspace are skipped, so an interrupted batch resumes where it stopped.
+    """
+    from pydantic import BaseModel
+
+    from lib import get_agent
+
+    context = _create_context(workspace_path)
+    agent = get_agent()
+    checkpoint = Path(results_path)
+    done_keys = await asyncio.to_thread(_load_done_keys, checkpoint)
+
+    for task_str in tasks:
+        key = _task_key(workspace_path, task_str)
+        if key in done_keys:
+            continue
+        results = await agent.run(user_prompt=task_str, deps=context)
+        output = results.output
+        print(output)
+        record = {
+            "key": key,
+            "task": task_str,
+            # JSON mode turns field types json.dumps cannot handle (datetime, Path, ...) into strings
+            "output": output.model_dump(mode="json") if isinstance(output, BaseModel) else output,
+        }
+        await asyncio.to_thread(_append_result, checkpoint, record)
+        done_keys.add(key)
+
+
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Use uvloop when it is installed; it has no Windows build, so the default loop stays the fallback"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def run_ui(event_bus: "EventBus | None" = None) -> None:
+    """
+    Main entry point for the UI.
+    Pass the bus the agent emits on when running this in its own thread; it defaults to the shared bus.
+    """
     from cli.console import TerminalUI
     from lib import get_event_bus
 
-    event_bus = get_event_bus()
+    if event_bus is None:
+        event_bus = get_event_bus()
 
     # Create the UI with the event bus
     session_id = "terminal-ui-session"
     ui = TerminalUI(session_id, event_bus)
     ui.initialize()
-    strt_time = time.time()
-    one_second = 60
+    deadline = time.monotonic() + 60
+    refresh_signal = event_bus.refresh_signal
     try:
         while True:
             ui.refresh()
-            time.sleep(0.2)
-            if time.time() - strt_time > one_second:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
+            # Sleep until an event is emitted rather than waking on a fixed interval
+            if refresh_signal.wait(timeout=min(5.0, remaining)):
+                refresh_signal.clear()
+                time.sleep(0.005)  # Let a burst of events land before redrawing
     except Exception as e:
         print(f"Error in UI loop: {e}")
     except KeyboardInterrupt:
@@ -77,4 +161,5 @@ if __name__ == "__main__":
     # run_ui()
     # ui_thread.join()
     # asyncio.run(run_agent(workspace_path, tasks[0]))
-    asyncio.run(run_app(workspace_path))
+    # asyncio.run(run_tasks(workspace_path, tasks))
+    asyncio.run(run_app(workspace_path), loop_factory=_loop_factory())
@@ -0,0 +1,42 @@
+"""Opt-in on-disk cache for provider test answers, enabled with CI_LLM_CACHE=1."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+from pydantic_ai import Agent
+
+T = TypeVar("T")
+
+
+def cache_enabled(env: Mapping[str, str]) -> bool:
+    return env.get("CI_LLM_CACHE") == "1"
+
+
+def _cache_key(agent: Agent[Any, Any], prompt: str, output_type: type) -> str:
+    model = agent.model
+    model_name = model if isinstance(model, str) else getattr(model, "model_name", repr(model))
+    raw = json.dumps([model_name, agent.name, prompt, repr(output_type)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def cached_run(agent: Agent[Any, Any], prompt: str, output_type: type[T], cache_dir: Path | None) -> T:
+    """
+    Run prompt on agent and return its output.
+    With a cache directory, an answer stored for the same model, agent, prompt and output type is
+    returned without calling the provider; new answers are stored as JSON.
+    """
+    if cache_dir is None:
+        return (await agent.run(user_prompt=prompt, output_type=output_type)).output
+    adapter = TypeAdapter(output_type)
+    cache_file = cache_dir / f"{_cache_key(agent, prompt, output_type)}.json"
+    try:
+        return adapter.validate_json(cache_file.read_bytes())
+    except FileNotFoundError:
+        pass
+    output = (await agent.run(user_prompt=prompt, output_type=output_type)).output
+    cache_file.write_bytes(adapter.dump_json(output))
+    return output
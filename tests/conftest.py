@@ -0,0 +1,130 @@
+# ruff: noqa: PLC0415
+import asyncio
+import importlib.util
+import os
+from collections.abc import AsyncIterator, Mapping
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from pydantic_ai import Agent
+
+from tests._llm_cache import cache_enabled
+
+SYSTEM_PROMPT = "You are a helpful Abent help user to resolve their queries."
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Used when OLLAMA_API_BASE, the variable the agent factory reads, is not set
+DEFAULT_OLLAMA_BASE_URL = "http://localhost:11434/v1"
+
+
+def _require_env(env: Mapping[str, str], *names: str) -> None:
+    """Skip the requesting test unless every named variable is set, so a plain pytest run never calls a provider"""
+    missing = [name for name in names if not env.get(name)]
+    if missing:
+        pytest.skip(f"provider not configured, missing {', '.join(missing)}")
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run async tests on uvloop when it is installed; without it (e.g. on Windows) the default policy is kept"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.get_event_loop_policy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def env() -> Mapping[str, str]:
+    """Environment with .env applied, loaded once and only when a provider test is selected"""
+    load_dotenv()
+    return os.environ
+
+
+@pytest.fixture(scope="session")
+def llm_cache_dir(env: Mapping[str, str], pytestconfig: pytest.Config) -> Path | None:
+    """Directory for cached provider answers under .pytest_cache, or None when CI_LLM_CACHE is not set"""
+    if not cache_enabled(env):
+        return None
+    return pytestconfig.cache.mkdir("llm")
+
+
+# The provider tests share one event loop so the agents and their connection pool live for the whole session
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_client() -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        timeout=httpx.Timeout(60.0),
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def aws_agent(env: Mapping[str, str]) -> Agent[None, str]:
+    if not (env.get("AWS_ACCESS_KEY_ID") or env.get("AWS_PROFILE")):
+        pytest.skip("provider not configured, set AWS_ACCESS_KEY_ID or AWS_PROFILE")
+
+    import boto3
+    from botocore.config import Config
+    from pydantic_ai.models.bedrock import BedrockConverseModel
+    from pydantic_ai.providers.bedrock import BedrockProvider
+
+    # Bedrock goes through boto3 rather than httpx, so its pool and keep-alive are set on the botocore client
+    bedrock_client = boto3.Session(profile_name=env.get("AWS_PROFILE", None)).client(
+        "bedrock-runtime",
+        region_name=env.get("AWS_REGION", None),
+        aws_access_key_id=env.get("AWS_ACCESS_KEY_ID", None),
+        aws_secret_access_key=env.get("AWS_SECRET_ACCESS_KEY", None),
+        config=Config(max_pool_connections=20, tcp_keepalive=True),
+    )
+    model_ = BedrockConverseModel(
+        "us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+        provider=BedrockProvider(bedrock_client=bedrock_client),
+    )
+    return Agent[None, str](name="Agent1", model=model_, output_type=str, retries=3, system_prompt=SYSTEM_PROMPT)
+
+
+@pytest.fixture(scope="session")
+def azure_agent(env: Mapping[str, str], http_client: httpx.AsyncClient) -> Agent[None, str]:
+    _require_env(env, "AZURE_API_BASE", "AZURE_API_KEY")
+
+    from openai import AsyncAzureOpenAI
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.azure import AzureProvider
+
+    model_ = OpenAIModel(
+        "finaclegpt4.1",
+        provider=AzureProvider(
+            openai_client=AsyncAzureOpenAI(
+                azure_endpoint=env.get("AZURE_API_BASE", ""),
+                azure_deployment="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+                api_version=env.get("AZURE_API_VERSION", ""),
+                api_key=env.get("AZURE_API_KEY", ""),
+                http_client=http_client,
+            )
+        ),
+    )
+    return Agent[None, str](name="Agent1", model=model_, output_type=str, retries=3, system_prompt=SYSTEM_PROMPT)
+
+
+@pytest.fixture(scope="session")
+def ollama_agent(env: Mapping[str, str], http_client: httpx.AsyncClient) -> Agent[None, str]:
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    base_url = env.get("OLLAMA_API_BASE") or DEFAULT_OLLAMA_BASE_URL
+    try:
+        httpx.get(f"{base_url}/models", timeout=2.0).raise_for_status()
+    except httpx.HTTPError as e:
+        pytest.skip(f"no Ollama server at {base_url}: {e}")
+
+    ollama_model = OpenAIModel(
+        model_name="qwen3:8b",
+        provider=OpenAIProvider(base_url=base_url, http_client=http_client),
+    )
+    return Agent(ollama_model)
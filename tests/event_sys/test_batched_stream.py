@@ -0,0 +1,145 @@
+# ruff: noqa: S101
+"""Test cases for BatchedStreamOut"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+import pytest
+from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
+
+from lib.event_handler import handel_streaming_events
+from lib.event_sys.async_bus import EventBus
+from lib.event_sys.types import BatchedStreamOut, StreamOutEvent
+
+# Deltas pushed with distinct part indexes, so none of them are merged
+UNMERGED_DELTAS = 2
+
+
+def text_delta(content: str, index: int = 0, session_id: str = "test_session") -> StreamOutEvent:
+    """Create a test StreamOutEvent with part_delta | text event type"""
+    return StreamOutEvent(
+        session_id=session_id, data=PartDeltaEvent(index=index, delta=TextPartDelta(content_delta=content))
+    )
+
+
+def part_start(index: int = 1, session_id: str = "test_session") -> StreamOutEvent:
+    """Create a test StreamOutEvent with part_start | text event type"""
+    return StreamOutEvent(session_id=session_id, data=PartStartEvent(index=index, part=TextPart(content="")))
+
+
+def delta_text(event: StreamOutEvent) -> str:
+    assert isinstance(event.data, PartDeltaEvent)
+    assert isinstance(event.data.delta, TextPartDelta)
+    return event.data.delta.content_delta
+
+
+@pytest.mark.asyncio
+async def test_flushes_merged_deltas_at_flush_size() -> None:
+    """Test that a full buffer is delivered as one merged delta"""
+    received: list[StreamOutEvent] = []
+
+    async def handler(event: StreamOutEvent) -> None:
+        received.append(event)
+
+    batcher = BatchedStreamOut(handler, flush_interval_ms=10_000, flush_size=3)
+    for content in ("a", "b", "c"):
+        await batcher.push(text_delta(content))
+
+    assert [delta_text(event) for event in received] == ["abc"]
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_other_events_flush_buffer_first() -> None:
+    """Test that non-delta events are delivered after the deltas buffered before them"""
+    received: list[StreamOutEvent] = []
+
+    async def handler(event: StreamOutEvent) -> None:
+        received.append(event)
+
+    batcher = BatchedStreamOut(handler, flush_interval_ms=10_000, flush_size=16)
+    await batcher.push(text_delta("Hello, "))
+    await batcher.push(text_delta("world"))
+    await batcher.push(part_start(index=1))
+
+    assert [type(event.data) for event in received] == [PartDeltaEvent, PartStartEvent]
+    assert delta_text(received[0]) == "Hello, world"
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval() -> None:
+    """Test that buffered deltas are delivered once the flush interval elapses"""
+    received: list[StreamOutEvent] = []
+    flushed = asyncio.Event()
+
+    async def handler(event: StreamOutEvent) -> None:
+        received.append(event)
+        if len(received) == UNMERGED_DELTAS:
+            flushed.set()
+
+    batcher = BatchedStreamOut(handler, flush_interval_ms=10, flush_size=16)
+    await batcher.push(text_delta("a", index=0))
+    await batcher.push(text_delta("b", index=1))
+    assert received == []
+
+    await asyncio.wait_for(flushed.wait(), timeout=1)
+    assert [delta_text(event) for event in received] == ["a", "b"]
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_size_flush_restarts_the_interval() -> None:
+    """Test that deltas buffered after a size flush wait a full interval, not the old timer's deadline"""
+    received: list[StreamOutEvent] = []
+
+    async def handler(event: StreamOutEvent) -> None:
+        received.append(event)
+
+    batcher = BatchedStreamOut(handler, flush_interval_ms=100, flush_size=2)
+    await batcher.push(text_delta("a"))
+    await asyncio.sleep(0.08)
+    await batcher.push(text_delta("b"))
+    await batcher.push(text_delta("c"))
+    await asyncio.sleep(0.04)
+    assert [delta_text(event) for event in received] == ["ab"]
+
+    await batcher.aclose()
+    assert [delta_text(event) for event in received] == ["ab", "c"]
+
+
+@pytest.mark.asyncio
+async def test_aclose_raises_timed_flush_error() -> None:
+    """Test that a handler error during a timed flush is raised by aclose instead of being lost"""
+
+    async def handler(event: StreamOutEvent) -> None:
+        raise RuntimeError(delta_text(event))
+
+    batcher = BatchedStreamOut(handler, flush_interval_ms=1, flush_size=16)
+    await batcher.push(text_delta("lost"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(RuntimeError, match="lost"):
+        await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_streaming_events_reach_the_bus_batched() -> None:
+    """Test that the agent stream handler emits merged text deltas and other events in order"""
+    event_bus = EventBus()
+    received: list[StreamOutEvent] = []
+    event_bus.subscribe("part_delta | text", received.append)
+    event_bus.subscribe("part_start | text", received.append)
+
+    async def event_stream() -> AsyncIterator[PartDeltaEvent | PartStartEvent]:
+        for content in ("Hello, ", "world"):
+            yield PartDeltaEvent(index=0, delta=TextPartDelta(content_delta=content))
+        yield PartStartEvent(index=1, part=TextPart(content=""))
+
+    ctx = SimpleNamespace(deps=SimpleNamespace(event_bus=event_bus))
+    await handel_streaming_events(ctx, event_stream(), session_id="test_session")  # type: ignore[arg-type]
+
+    assert [type(event.data) for event in received] == [PartDeltaEvent, PartStartEvent]
+    assert delta_text(received[0]) == "Hello, world"
+    assert {event.session_id for event in received} == {"test_session"}
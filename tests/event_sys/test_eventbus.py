@@ -8,6 +8,7 @@ from unittest.mock import MagicMock
 import pytest
 from pydantic_ai.messages import PartStartEvent, TextPart
 
+from lib.event_sys import get_event_bus, reset_event_bus
 from lib.event_sys.async_bus import (
     BackpressureStrategy,
     EventBus,
@@ -60,7 +61,7 @@ class TestEventBus:
         assert isinstance(subscription, EventSubscription)
         assert subscription.event_type == "part_start | text"
         assert subscription.handler == handler
-        assert len(event_bus._subscriptions["part_start | text"]) == 1
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 1
 
     @pytest.mark.asyncio
     async def test_subscribe_once(self, event_bus: EventBus) -> None:
@@ -70,7 +71,20 @@ class TestEventBus:
         subscription = event_bus.subscribe_once("part_start | text", handler)
 
         assert isinstance(subscription, EventSubscription)
-        assert len(event_bus._subscriptions["part_start | text"]) == 1
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 1
+
+    @pytest.mark.asyncio
+    async def test_subscribe_once_handles_single_event(self, event_bus: EventBus, mock_event: StreamOutEvent) -> None:
+        """Test that a one-time subscription handles exactly one event and then cancels itself"""
+        handler = MagicMock()
+
+        subscription = event_bus.subscribe_once("part_start | text", handler)
+
+        await event_bus.emit(mock_event)
+        await event_bus.emit(mock_event)
+
+        handler.assert_called_once_with(mock_event)
+        assert subscription.is_cancelled
 
     @pytest.mark.asyncio
     async def test_subscribe_session(self, event_bus: EventBus) -> None:
@@ -81,22 +95,28 @@ class TestEventBus:
 
         assert isinstance(subscription, SessionEventSubscription)
         assert subscription.session_id == "test_session"
-        assert len(event_bus._subscriptions["part_start | text"]) == 1
+        assert len(event_bus._subscriptions[("part_start | text", "test_session")]) == 1
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 0
         assert len(event_bus._session_subscriptions["test_session"]) == 1
 
     @pytest.mark.asyncio
     async def test_emit_event(self, event_bus: EventBus, mock_event: StreamOutEvent) -> None:
         """Test event emission"""
-        handler = MagicMock()
-        subscription = event_bus.subscribe("part_start | text", handler)
+        received_events: list[StreamOutEvent | UserInputEvent] = []
+        subscription = event_bus.subscribe("part_start | text", received_events.append)
 
+        # Direct handlers have run by the time emit returns
         await event_bus.emit(mock_event)
 
-        # Wait a bit for processing
-        await asyncio.sleep(0.1)
+        assert received_events == [mock_event]
+        assert subscription.event_queue.qsize() == 0
 
-        # Event should be queued
-        assert subscription.event_queue.qsize() >= 0  # Event might be processed already
+    @pytest.mark.asyncio
+    async def test_emit_without_subscribers_adds_no_keys(self, event_bus: EventBus, mock_event: StreamOutEvent) -> None:
+        """Test that emitting an unsubscribed event type does not grow the subscription registry"""
+        await event_bus.emit(mock_event)
+
+        assert len(event_bus._subscriptions) == 0
 
     @pytest.mark.asyncio
     async def test_get_handler_count(self, event_bus: EventBus) -> None:
@@ -144,6 +164,8 @@ class TestEventBus:
 
         assert subscription.is_cancelled
         assert len(event_bus._session_subscriptions) == 0
+        assert ("part_start | text", "test_session") not in event_bus._subscriptions
+        assert event_bus._subscription_count == 0
 
     @pytest.mark.asyncio
     async def test_get_backpressure_stats(self, event_bus: EventBus) -> None:
@@ -172,7 +194,33 @@ class TestEventBus:
         removed_count = await event_bus.cleanup_cancelled_subscriptions()
 
         assert removed_count == 1
-        assert len(event_bus._subscriptions["part_start | text"]) == 0
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_without_cancelled_subscriptions(self, event_bus: EventBus) -> None:
+        """Test that cleanup leaves active subscriptions alone when nothing was cancelled"""
+        _ = event_bus.subscribe("part_start | text", [].append)
+
+        removed_count = await event_bus.cleanup_cancelled_subscriptions()
+
+        assert removed_count == 0
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_subscriptions_are_compacted(self, event_bus: EventBus) -> None:
+        """Test that cancelled subscriptions are dropped once they exceed the tombstone ratio"""
+        subscriptions = [event_bus.subscribe("part_start | text", [].append) for _ in range(100)]
+
+        for subscription in subscriptions[:25]:
+            subscription.cancel()
+
+        # At exactly 25% tombstones nothing is compacted yet
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 100
+
+        subscriptions[25].cancel()
+
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 74
+        assert event_bus.get_handler_count("part_start | text") == 74
 
     @pytest.mark.asyncio
     async def test_set_global_backpressure_strategy(self, event_bus: EventBus) -> None:
@@ -205,7 +253,7 @@ class TestEventBus:
         async with event_bus.temporary_subscription("part_start | text", handler) as subscription:
             assert isinstance(subscription, EventSubscription)
             assert not subscription.is_cancelled
-            assert len(event_bus._subscriptions["part_start | text"]) == 1
+            assert len(event_bus._subscriptions[("part_start | text", None)]) == 1
 
         # Subscription should be cancelled after context
         assert subscription.is_cancelled
@@ -213,39 +261,83 @@ class TestEventBus:
     @pytest.mark.asyncio
     async def test_multiple_handlers_same_event(self, event_bus: EventBus, mock_event: StreamOutEvent) -> None:
         """Test multiple handlers for the same event"""
-        handler1 = MagicMock()
-        handler2 = MagicMock()
+        received_events1: list[StreamOutEvent | UserInputEvent] = []
+        received_events2: list[StreamOutEvent | UserInputEvent] = []
 
-        _ = event_bus.subscribe("part_start | text", handler1)
-        _ = event_bus.subscribe("part_start | text", handler2)
+        _ = event_bus.subscribe("part_start | text", received_events1.append)
+        _ = event_bus.subscribe("part_start | text", received_events2.append)
 
         await event_bus.emit(mock_event)
 
-        # Wait for processing
-        await asyncio.sleep(0.1)
-
-        # Both subscriptions should have events queued
-        assert len(event_bus._subscriptions["part_start | text"]) == 2
+        # Both subscriptions should have received the event
+        assert len(event_bus._subscriptions[("part_start | text", None)]) == 2
+        assert received_events1 == [mock_event]
+        assert received_events2 == [mock_event]
 
     @pytest.mark.asyncio
     async def test_background_task_management(self, event_bus: EventBus) -> None:
-        """Test that background tasks are properly managed"""
+        """Test that queued subscriptions only run a worker while they have events"""
         handler = MagicMock()
 
-        # Subscribe should create background tasks
-        subscription = event_bus.subscribe("part_start | text", handler)
+        subscription = event_bus.subscribe("part_start | text", handler, direct=False)
+
+        # An idle queued subscription holds no task
+        assert subscription._processing_task is None
+        assert len(event_bus._background_tasks) == 0
 
-        # There should be background tasks
-        assert len(event_bus._background_tasks) > 0
+        # An event starts a worker
+        await event_bus.emit(stream_out_event())
+        assert subscription._processing_task is not None
+        assert len(event_bus._background_tasks) == 1
+
+        # Wait for the event to be handled; the worker exits once the queue is drained
+        await asyncio.wait_for(subscription._processing_task, timeout=1)
+
+        handler.assert_called_once()
+        assert subscription._processing_task is None
+        assert len(event_bus._background_tasks) == 0
 
-        # Cancel subscription
         subscription.cancel()
 
-        # Wait a bit for cleanup
-        await asyncio.sleep(0.1)
+    @pytest.mark.asyncio
+    async def test_direct_subscription_dispatches_on_emit(
+        self, event_bus: EventBus, mock_event: StreamOutEvent
+    ) -> None:
+        """Test that direct subscriptions run the handler from emit without a worker task"""
+        received_events = []
 
-        # Background tasks should be cleaned up eventually
-        # (This might not happen immediately due to async cleanup)
+        async def handler(event: StreamOutEvent | UserInputEvent) -> None:
+            received_events.append(event)
+
+        subscription = event_bus.subscribe("part_start | text", handler)
+
+        await event_bus.emit(mock_event)
+
+        assert received_events == [mock_event]
+        assert subscription._processing_task is None
+        assert subscription._processed_events == 1
+
+    @pytest.mark.asyncio
+    async def test_emit_nowait_does_not_wait_for_handlers(
+        self, event_bus: EventBus, mock_event: StreamOutEvent
+    ) -> None:
+        """Test that emit_nowait returns before direct handlers run and tracks their deliveries"""
+        received_events = []
+
+        async def handler(event: StreamOutEvent | UserInputEvent) -> None:
+            received_events.append(event)
+
+        event_bus.subscribe("part_start | text", handler)
+
+        event_bus.emit_nowait(mock_event)
+
+        assert received_events == []
+        assert len(event_bus._pending_deliveries) == 1
+
+        await asyncio.gather(*list(event_bus._pending_deliveries))
+
+        assert received_events == [mock_event]
+        assert len(event_bus._pending_deliveries) == 0
 
     @pytest.mark.asyncio
     async def test_event_processing_error_handling(self, event_bus: EventBus, mock_event: StreamOutEvent) -> None:
@@ -256,12 +348,9 @@ class TestEventBus:
 
         subscription = event_bus.subscribe("part_start | text", failing_handler)
 
-        # This should not raise an exception
+        # This should not raise an exception; the direct handler has run when emit returns
         await event_bus.emit(mock_event)
 
-        # Wait for processing
-        await asyncio.sleep(0.2)
-
         # Subscription should still be active despite handler error
         assert not subscription.is_cancelled
 
@@ -285,17 +374,41 @@ class TestEventBusIntegration:
         event1 = stream_out_event(data="event1")
         event2 = stream_out_event(index=2, data="event2")
 
+        # Direct handlers have run by the time emit returns
         await event_bus.emit(event1)
         await event_bus.emit(event2)
 
-        # Wait for processing
-        await asyncio.sleep(0.3)
-
         # Events should be processed
         assert len(received_events) == 2
         assert received_events[0].data.part.content == "event1"
         assert received_events[1].data.part.content == "event2"
 
+    @pytest.mark.asyncio
+    async def test_emit_many_preserves_order(self, event_bus: EventBus) -> None:
+        """Test that batched emission delivers every event to each subscriber in order"""
+        received_events = []
+        session_events = []
+
+        async def handler(event: StreamOutEvent) -> None:
+            received_events.append(event.data.part.content)
+
+        def session_handler(event: StreamOutEvent) -> None:
+            session_events.append(event.data.part.content)
+
+        event_bus.subscribe("part_start | text", handler)
+        event_bus.subscribe_session("session1", "part_start | text", session_handler)
+
+        await event_bus.emit_many(
+            [
+                stream_out_event(session_id="session1", index=1, data="first"),
+                stream_out_event(session_id="session2", index=2, data="second"),
+                stream_out_event(session_id="session1", index=3, data="third"),
+            ]
+        )
+
+        assert received_events == ["first", "second", "third"]
+        assert session_events == ["first", "third"]
+
     @pytest.mark.asyncio
     async def test_session_event_filtering(self, event_bus: EventBus) -> None:
         """Test that session subscriptions only receive their session's events"""
@@ -316,14 +429,31 @@ class TestEventBusIntegration:
         event1 = stream_out_event(session_id="session1", data="for_session1")
         event2 = stream_out_event(session_id="session2", data="for_session2")
 
-        await event_bus.emit(event1)
-        await event_bus.emit(event2)
-
-        # Wait for processing
-        await asyncio.sleep(0.3)
+        # Direct handlers have run by the time emit_many returns
+        await event_bus.emit_many([event1, event2])
 
         # Each session should only receive its own events
         assert len(session1_events) == 1
         assert len(session2_events) == 1
         assert session1_events[0].data.part.content == "for_session1"
         assert session2_events[0].data.part.content == "for_session2"
+
+
+class TestGetEventBus:
+    """Test cases for the process-wide event bus"""
+
+    @pytest.mark.asyncio
+    async def test_bus_is_shared_across_threads_and_tasks(self) -> None:
+        """Test that threads and sibling tasks started before the first call all get the same bus"""
+        await reset_event_bus()
+
+        async def lookup() -> EventBus:
+            return get_event_bus()
+
+        try:
+            first, second = await asyncio.gather(lookup(), lookup())
+            in_thread = await asyncio.to_thread(get_event_bus)
+            assert first is second
+            assert in_thread is first
+        finally:
+            await reset_event_bus()
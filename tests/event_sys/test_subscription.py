@@ -1,4 +1,4 @@
-# ruff: noqa: S101
+# ruff: noqa: S101 SLF001
 
 import asyncio
 from unittest.mock import AsyncMock, MagicMock
@@ -7,14 +7,27 @@ import pytest
 from pydantic_ai.messages import PartStartEvent, TextPart
 
 from lib.event_sys.async_bus import (
+    UNBOUNDED_RING_CAPACITY,
     BackpressureStrategy,
     EventBus,
     EventSubscription,
+    RingQueue,
     SessionEventSubscription,
 )
 from lib.event_sys.types import StreamOutEvent
 
 
+async def wait_for_processed(subscription: EventSubscription, count: int, timeout: float = 1.0) -> None:
+    """Wait until the subscription's worker has handled count events"""
+
+    async def _wait() -> None:
+        while subscription._processed_events < count:
+            subscription._progress.clear()
+            await subscription._progress.wait()
+
+    await asyncio.wait_for(_wait(), timeout=timeout)
+
+
 @pytest.fixture
 def event_bus() -> EventBus:
     """Create a fresh EventBus for each test"""
@@ -33,19 +46,14 @@ def test_event() -> StreamOutEvent:
 class TestEventSubscription:
     """Test cases for EventSubscription class"""
 
-    @pytest.fixture
-    def event_bus_mock(self) -> EventBus:
-        """Mock EventBus for subscription tests"""
-        return MagicMock()
-
     @pytest.fixture
     def subscription(self, event_bus: EventBus) -> EventSubscription:
         """Create a subscription for testing"""
-        handler = MagicMock()
+        received_events: list[StreamOutEvent] = []
         return EventSubscription(
             event_bus,
             "part_start | text",
-            handler,
+            received_events.append,
             queue_size=10,
             backpressure_strategy=BackpressureStrategy.DROP_OLDEST,
         )
@@ -114,11 +122,11 @@ class TestEventSubscription:
     @pytest.mark.asyncio
     async def test_enqueue_event_drop_newest_strategy(self, event_bus: EventBus) -> None:
         """Test DROP_NEWEST backpressure strategy"""
-        handler = MagicMock()
+        received_events: list[StreamOutEvent] = []
         subscription = EventSubscription(
             event_bus,
             "part_start | text",
-            handler,
+            received_events.append,
             queue_size=2,
             backpressure_strategy=BackpressureStrategy.DROP_NEWEST,
         )
@@ -158,9 +166,13 @@ class TestEventSubscription:
     @pytest.mark.asyncio
     async def test_enqueue_event_block_strategy(self, event_bus: EventBus) -> None:
         """Test BLOCK backpressure strategy"""
-        handler = MagicMock()
+        received_events: list[StreamOutEvent] = []
         subscription = EventSubscription(
-            event_bus, "part_start | text", handler, queue_size=1, backpressure_strategy=BackpressureStrategy.BLOCK
+            event_bus,
+            "part_start | text",
+            received_events.append,
+            queue_size=1,
+            backpressure_strategy=BackpressureStrategy.BLOCK,
         )
 
         # Fill queue
@@ -195,6 +207,32 @@ class TestEventSubscription:
         result = await enqueue_with_timeout()
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_block_strategy_change_releases_blocked_producer(
+        self, event_bus: EventBus, test_event: StreamOutEvent
+    ) -> None:
+        """Test that switching away from BLOCK wakes a producer waiting on a full queue"""
+        received_events: list[StreamOutEvent] = []
+        subscription = EventSubscription(
+            event_bus,
+            "part_start | text",
+            received_events.append,
+            queue_size=1,
+            backpressure_strategy=BackpressureStrategy.BLOCK,
+        )
+        await subscription.enqueue_event(test_event)
+
+        blocked = asyncio.create_task(subscription.enqueue_event(test_event))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        subscription.backpressure_strategy = BackpressureStrategy.DROP_NEWEST
+
+        # The waiting event is now handled as DROP_NEWEST would: dropped, since the queue is still full
+        assert await asyncio.wait_for(blocked, timeout=1) is False
+        assert subscription._dropped_events == 1
+        assert subscription.event_queue.qsize() == 1
+
     @pytest.mark.asyncio
     async def test_start_and_stop_processing(self, subscription: EventSubscription) -> None:
         """Test starting and stopping event processing"""
@@ -215,36 +253,37 @@ class TestEventSubscription:
     @pytest.mark.asyncio
     async def test_process_sync_handler(self, event_bus: EventBus, test_event: StreamOutEvent) -> None:
         """Test processing events with sync handler"""
-        handler = MagicMock()
-        subscription = EventSubscription(event_bus, "part_start | text", handler)
+        received_events: list[StreamOutEvent] = []
+        subscription = EventSubscription(event_bus, "part_start | text", received_events.append)
 
         await subscription.enqueue_event(test_event)
 
         # Start processing
         await subscription.start_processing()
 
-        # Wait a bit for processing
-        await asyncio.sleep(0.2)
+        # Wait for the worker to handle the event
+        await wait_for_processed(subscription, 1)
 
         # Stop processing
         await subscription.stop_processing()
 
         # Handler should have been called
+        assert received_events == [test_event]
         assert subscription._processed_events == 1
 
     @pytest.mark.asyncio
-    async def test_process_async_handler(self, event_bus_mock: MagicMock, test_event: StreamOutEvent) -> None:
+    async def test_process_async_handler(self, event_bus: EventBus, test_event: StreamOutEvent) -> None:
         """Test processing events with async handler"""
         handler = AsyncMock()
-        subscription = EventSubscription(event_bus_mock, "part_start | text", handler)
+        subscription = EventSubscription(event_bus, "part_start | text", handler)
 
         await subscription.enqueue_event(test_event)
 
         # Start processing
         await subscription.start_processing()
 
-        # Wait a bit for processing
-        await asyncio.sleep(0.2)
+        # Wait for the worker to handle the event
+        await wait_for_processed(subscription, 1)
 
         # Stop processing
         await subscription.stop_processing()
@@ -253,6 +292,25 @@ class TestEventSubscription:
         handler.assert_called_once()
         assert subscription._processed_events == 1
 
+    @pytest.mark.asyncio
+    async def test_process_async_callable_handler(self, event_bus: EventBus, test_event: StreamOutEvent) -> None:
+        """Test that an object with an async __call__ is awaited rather than run in the executor"""
+        received_events: list[StreamOutEvent] = []
+
+        class AsyncCallable:
+            async def __call__(self, event: StreamOutEvent) -> None:
+                received_events.append(event)
+
+        subscription = EventSubscription(event_bus, "part_start | text", AsyncCallable())
+        assert subscription._is_coro
+
+        await subscription.enqueue_event(test_event)
+        await subscription.start_processing()
+        await wait_for_processed(subscription, 1)
+        await subscription.stop_processing()
+
+        assert received_events == [test_event]
+
     def test_subscription_stats(self, subscription: EventSubscription) -> None:
         """Test subscription statistics"""
         subscription._processed_events = 5
@@ -302,6 +360,69 @@ class TestSessionEventSubscription:
     @pytest.mark.asyncio
     async def test_session_filtering(self, session_subscription: SessionEventSubscription) -> None:
         """Test that session subscription filters events by session"""
-        # This test would require more complex setup to test the session filtering
-        # The session filtering happens in the handler wrapper
         assert session_subscription.session_id == "test_session"
+        assert session_subscription.session_filter == "test_session"
+
+        other_session_event = StreamOutEvent(
+            session_id="other_session",
+            data=PartStartEvent(index=1, part=TextPart(content="Hi there!", part_kind="text"), event_kind="part_start"),
+        )
+        own_session_event = StreamOutEvent(
+            session_id="test_session",
+            data=PartStartEvent(index=2, part=TextPart(content="Hi there!", part_kind="text"), event_kind="part_start"),
+        )
+
+        assert await session_subscription.enqueue_event(other_session_event) is False
+        assert await session_subscription.enqueue_event(own_session_event) is True
+        assert session_subscription.event_queue.qsize() == 1
+
+
+class TestRingQueue:
+    """Test cases for RingQueue"""
+
+    def test_drop_oldest_keeps_newest_items(self) -> None:
+        """Test that put_drop_oldest overwrites the oldest item once the queue is full"""
+        queue = RingQueue(3)
+
+        dropped = [queue.put_drop_oldest(i) for i in range(5)]
+
+        assert dropped == [False, False, False, True, True]
+        assert queue.qsize() == 3
+        assert [queue.get_nowait() for _ in range(3)] == [2, 3, 4]
+        assert queue.empty()
+
+    def test_put_nowait_respects_maxsize(self) -> None:
+        """Test that capacity follows maxsize, not the rounded-up buffer size"""
+        queue = RingQueue(3)
+        for i in range(3):
+            queue.put_nowait(i)
+
+        assert queue.full()
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(3)
+
+    def test_non_positive_maxsize_is_unbounded(self) -> None:
+        """Test that maxsize <= 0 means unbounded, as with asyncio.Queue"""
+        queue = RingQueue(0)
+        items = list(range(UNBOUNDED_RING_CAPACITY * 3))
+        # Start off the buffer's first slot so growing has to unwrap the ring
+        queue.put_nowait(-1)
+        queue.get_nowait()
+        for item in items:
+            assert queue.put_drop_oldest(item) is False
+
+        assert not queue.full()
+        assert [queue.get_nowait() for _ in items] == items
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_get_waits_for_item(self) -> None:
+        """Test that get blocks until an item is put"""
+        queue = RingQueue(2)
+        getter = asyncio.create_task(queue.get())
+
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        queue.put_nowait("event")
+        assert await asyncio.wait_for(getter, timeout=1) == "event"
@@ -1,14 +1,10 @@
-# ruff: noqa: T201
+# ruff: noqa: T201 S101
+import asyncio
 import logging
 
-from dotenv import load_dotenv
+import pytest
 from pydantic import BaseModel
 from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
-
-load_dotenv()
-
 
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
@@ -24,11 +20,19 @@ class CityLocation(BaseModel):
     country: str
 
 
-ollama_model = OpenAIModel(model_name="qwen3:8b", provider=OpenAIProvider(base_url="http://localhost:11434/v1"))
-agent = Agent(ollama_model, output_type=CityLocation)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ollama_structured_output(ollama_agent: Agent) -> None:
+    result = await ollama_agent.run("Where were the olympics held in 2012?", output_type=CityLocation)
+    print(result.output)
+    # > city='London' country='United Kingdom'
+    print(result.usage())
+    # > Usage(requests=1, request_tokens=57, response_tokens=8, total_tokens=65)
+    assert result.output.city
+
 
-result = agent.run_sync("Where were the olympics held in 2012?")
-print(result.output)
-# > city='London' country='United Kingdom'
-print(result.usage())
-# > Usage(requests=1, request_tokens=57, response_tokens=8, total_tokens=65)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ollama_structured_output_batch(ollama_agent: Agent) -> None:
+    # The server only overlaps these when started with OLLAMA_NUM_PARALLEL > 1; otherwise it queues them
+    prompts = ("Where were the olympics held in 2012?", "Where were the olympics held in 2016?")
+    results = await asyncio.gather(*(ollama_agent.run(prompt, output_type=CityLocation) for prompt in prompts))
+    assert all(result.output.city for result in results)
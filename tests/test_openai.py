@@ -1,10 +1,14 @@
-# ruff: noqa: T201
+# ruff: noqa: T201 S101
 import asyncio
 import logging
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
 from string import Template
+from types import MappingProxyType
 from typing import Union
 
+import pytest
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
@@ -27,35 +31,42 @@ class Failure(BaseModel):
 @dataclass(frozen=True, slots=True)
 class AgentContext:
     shop_name: str
+    # Tool results for this run, so repeated identical calls within a turn are answered once
+    tool_cache: dict[tuple[str, str], ToolReturn] = field(default_factory=dict)
 
 
-model_ = OpenAIModel(
-    model_name="gpt-4o-mini",
-    provider=OpenAIProvider(openai_client=AsyncOpenAI()),
-)
-
-agent = Agent[AgentContext, str | Failure](
-    name="Fruit Shop Agent",
-    model=model_,
-    deps_type=AgentContext,
-    output_type=Union[str, Failure],  # type: ignore # noqa: PGH003
-    retries=3,
-)
-
 SYSTEM_MESSAGE = (
     "You are a helpful Food Seller agent.\n"
     "You help users with information about food items, their colors, and other details.\n"
     "You are working at the shop: ${SHOP_NAME}"
 )
+SYSTEM_TEMPLATE = Template(SYSTEM_MESSAGE)
+
+
+@lru_cache(maxsize=64)
+def render_system_prompt(shop_name: str) -> str:
+    return SYSTEM_TEMPLATE.substitute(SHOP_NAME=shop_name)
+
+
+FOOD_PRICES = MappingProxyType(
+    {
+        "apple": 1.2,
+        "banana": 0.5,
+        "grape": 2.0,
+        "pineapple": 3.0,
+        "orange": 1.0,
+        "kiwi": 1.5,
+        "mango": 2.5,
+        "strawberry": 2.0,
+    }
+)
 
 
-@agent.system_prompt
 async def get_system_prompt(ctx: RunContext[AgentContext]) -> str:
     # The system prompt uses the shop_name from AgentContext
-    return Template(SYSTEM_MESSAGE).substitute(SHOP_NAME=ctx.deps.shop_name)
+    return render_system_prompt(ctx.deps.shop_name)
 
 
-@agent.tool
 async def get_fruit_price(ctx: RunContext[AgentContext], food_name: str) -> ToolReturn:
     """Get the price of a fruit per kilogram.
 
@@ -65,39 +76,67 @@ async def get_fruit_price(ctx: RunContext[AgentContext], food_name: str) -> Tool
     Returns:
         returns price of the fruit or an error message if not found.
     """
-    food_prices = {
-        "apple": 1.2,
-        "banana": 0.5,
-        "grape": 2.0,
-        "pineapple": 3.0,
-        "orange": 1.0,
-        "kiwi": 1.5,
-        "mango": 2.5,
-        "strawberry": 2.0,
-    }
-
-    price = food_prices.get(food_name.lower(), None)
+    key = ("get_fruit_price", food_name.lower())
+    cached = ctx.deps.tool_cache.get(key)
+    if cached is not None:
+        return cached
+    price = FOOD_PRICES.get(key[1])
     if price is None:
-        return ToolReturn(
+        result = ToolReturn(
             return_value=None,
             content=f"Price of {food_name} is not known.",
             metadata={"success": False, "error": "UNKNOWN_FRUIT"},
         )
-    return ToolReturn(
-        return_value=price,
-        content=f"The price of {food_name} is {price} per kilogram. ",
-        metadata={"success": True},
+    else:
+        result = ToolReturn(
+            return_value=price,
+            content=f"The price of {food_name} is {price} per kilogram. ",
+            metadata={"success": True},
+        )
+    ctx.deps.tool_cache[key] = result
+    return result
+
+
+# The OpenAI client is only built when the agent is first needed, so collecting this module needs no API key
+@cache
+def get_agent() -> Agent[AgentContext, str | Failure]:
+    model_ = OpenAIModel(
+        model_name="gpt-4o-mini",
+        provider=OpenAIProvider(openai_client=AsyncOpenAI()),
+    )
+    agent = Agent[AgentContext, str | Failure](
+        name="Fruit Shop Agent",
+        model=model_,
+        deps_type=AgentContext,
+        output_type=Union[str, Failure],  # type: ignore # noqa: PGH003
+        retries=3,
     )
+    agent.system_prompt(get_system_prompt)
+    agent.tool(get_fruit_price)
+    return agent
 
 
 task_str = "what is the price of an apple, banana, grape, pineapple?"
 
 
-async def run_agent(shop_name: str, task: str) -> None:
+shop_name = "Rahul's Fresh Foods"
+
+
+async def run_agent(shop_name: str, task: str) -> str | Failure:
+    # A fresh context per run starts each turn with an empty tool cache
     context = AgentContext(shop_name=shop_name)
-    results = await agent.run(user_prompt=task, deps=context)
+    results = await get_agent().run(user_prompt=task, deps=context)
     print(results.output)
+    return results.output
 
 
-shop_name = "Rahul's Fresh Foods"
-asyncio.run(run_agent(shop_name, task_str))
+@pytest.mark.asyncio
+async def test_fruit_shop_agent_prices() -> None:
+    if not os.environ.get("OPENAI_API_KEY"):
+        pytest.skip("OPENAI_API_KEY is not set")
+    output = await run_agent(shop_name, task_str)
+    assert not isinstance(output, Failure)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_agent(shop_name, task_str))
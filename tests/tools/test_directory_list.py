@@ -1,7 +1,6 @@
 # ruff: noqa: S101
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Generator, List
+from typing import List
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -34,6 +33,7 @@ EXPECTED_TOP_LEVEL_WITH_HIDDEN = 5  # includes .hidden_file and .hidden_dir
 EXPECTED_DIR_INFO_ENTRIES = 3  # file1.txt, file2.txt, and subdir1
 EXPECTED_DIR_INFO_DIRS = 1  # subdir1
 EXPECTED_DIR_INFO_FILES = 2  # file1.txt, file2.txt
+WIDE_TREE_DIRS = 500  # one leaf file in each
 
 
 def test_directory_entry_model() -> None:
@@ -68,35 +68,44 @@ def test_directory_info_model() -> None:
     assert info.files == TEST_INFO_FILES
 
 
-@pytest.fixture
-def temp_dir_structure() -> Generator[Path, None, None]:
-    """Create a temporary directory structure for testing."""
-    with TemporaryDirectory() as temp_dir:
-        root = Path(temp_dir)
+def _build_temp_dir_structure(root: Path) -> None:
+    """Create the directory structure shared by the listing tests under root."""
+    # Create some regular files
+    (root / "file1.txt").write_text("test content")
+    (root / "file2.txt").write_text("more content")
+
+    # Create a hidden file
+    (root / ".hidden_file").write_text("hidden content")
+
+    # Create subdirectories
+    sub_dir1 = root / "subdir1"
+    sub_dir1.mkdir()
+    (sub_dir1 / "subfile1.txt").write_text("subfile content")
 
-        # Create some regular files
-        (root / "file1.txt").write_text("test content")
-        (root / "file2.txt").write_text("more content")
+    # Create nested subdirectory
+    sub_dir2 = sub_dir1 / "nested"
+    sub_dir2.mkdir()
+    (sub_dir2 / "deep_file.txt").write_text("deep content")
 
-        # Create a hidden file
-        (root / ".hidden_file").write_text("hidden content")
+    # Create hidden directory
+    hidden_dir = root / ".hidden_dir"
+    hidden_dir.mkdir()
+    (hidden_dir / "hidden_subfile.txt").write_text("hidden subfile")
 
-        # Create subdirectories
-        sub_dir1 = root / "subdir1"
-        sub_dir1.mkdir()
-        (sub_dir1 / "subfile1.txt").write_text("subfile content")
 
-        # Create nested subdirectory
-        sub_dir2 = sub_dir1 / "nested"
-        sub_dir2.mkdir()
-        (sub_dir2 / "deep_file.txt").write_text("deep content")
+@pytest.fixture(scope="session")
+def temp_dir_structure(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary directory structure once for all tests that only read it."""
+    root = tmp_path_factory.mktemp("listing")
+    _build_temp_dir_structure(root)
+    return root
 
-        # Create hidden directory
-        hidden_dir = root / ".hidden_dir"
-        hidden_dir.mkdir()
-        (hidden_dir / "hidden_subfile.txt").write_text("hidden subfile")
 
-        yield root
+@pytest.fixture
+def mutable_temp_dir_structure(tmp_path: Path) -> Path:
+    """Create a fresh temporary directory structure for tests that add to it."""
+    _build_temp_dir_structure(tmp_path)
+    return tmp_path
 
 
 async def _run_list_recursive_test(
@@ -116,11 +125,8 @@ async def test_basic_listing_no_hidden(temp_dir_structure: Path) -> None:
 
     # Check if the right files and directories are included
     names = {entry.name for entry in entries}
-    assert "file1.txt" in names
-    assert "file2.txt" in names
-    assert "subdir1" in names
-    assert ".hidden_file" not in names
-    assert ".hidden_dir" not in names
+    assert frozenset({"file1.txt", "file2.txt", "subdir1"}) <= names
+    assert names.isdisjoint({".hidden_file", ".hidden_dir"})
 
     # Verify all entries are at depth 0
     for entry in entries:
@@ -150,11 +156,16 @@ async def test_recursive_listing(temp_dir_structure: Path) -> None:
     paths = {entry.path for entry in entries}
 
     # Verify files at various depths
-    assert str(temp_dir_structure / "file1.txt") in paths
-    assert str(temp_dir_structure / "subdir1") in paths
-    assert str(temp_dir_structure / "subdir1" / "subfile1.txt") in paths
-    assert str(temp_dir_structure / "subdir1" / "nested") in paths
-    assert str(temp_dir_structure / "subdir1" / "nested" / "deep_file.txt") in paths
+    expected = frozenset(
+        {
+            str(temp_dir_structure / "file1.txt"),
+            str(temp_dir_structure / "subdir1"),
+            str(temp_dir_structure / "subdir1" / "subfile1.txt"),
+            str(temp_dir_structure / "subdir1" / "nested"),
+            str(temp_dir_structure / "subdir1" / "nested" / "deep_file.txt"),
+        }
+    )
+    assert expected <= paths
 
 
 @pytest.mark.asyncio
@@ -166,21 +177,54 @@ async def test_depth_limitation(temp_dir_structure: Path) -> None:
     paths = {entry.path for entry in entries}
 
     # These should be included
-    assert str(temp_dir_structure / "file1.txt") in paths
-    assert str(temp_dir_structure / "subdir1" / "subfile1.txt") in paths
+    expected = frozenset({str(temp_dir_structure / "file1.txt"), str(temp_dir_structure / "subdir1" / "subfile1.txt")})
+    assert expected <= paths
 
     # This should NOT be included due to depth limitation
     assert str(temp_dir_structure / "subdir1" / "nested" / "deep_file.txt") not in paths
 
 
+@pytest.mark.asyncio
+async def test_recursive_listing_keeps_subtrees_in_place(mutable_temp_dir_structure: Path) -> None:
+    """Test that each subdirectory's contents follow its own entry, even when walked in parallel."""
+    for index in range(12):
+        sub_dir = mutable_temp_dir_structure / f"wide{index:02d}"
+        sub_dir.mkdir()
+        (sub_dir / "leaf.txt").write_text("leaf")
+
+    entries = await _run_list_recursive_test(mutable_temp_dir_structure, False, True, 3)
+
+    for position, entry in enumerate(entries):
+        if entry.is_dir and entry.name.startswith("wide"):
+            child = entries[position + 1]
+            assert child.path == str(Path(entry.path) / "leaf.txt")
+            assert child.depth == entry.depth + 1
+
+
+@pytest.mark.asyncio
+async def test_recursive_listing_wide_tree(mutable_temp_dir_structure: Path) -> None:
+    """Test that a very wide tree is walked completely with a bounded number of workers."""
+    wide_root = mutable_temp_dir_structure / "wide"
+    wide_root.mkdir()
+    for index in range(WIDE_TREE_DIRS):
+        sub_dir = wide_root / f"dir{index:03d}"
+        sub_dir.mkdir()
+        (sub_dir / "leaf.txt").write_text("leaf")
+
+    entries = await _list_directory_recursive(wide_root, False, True, 3, 0)
+
+    assert sum(entry.is_dir for entry in entries) == WIDE_TREE_DIRS
+    assert sum(not entry.is_dir for entry in entries) == WIDE_TREE_DIRS
+
+
 @pytest.mark.asyncio
 async def test_permission_error_handling() -> None:
     """Test handling of permission errors."""
     test_path = Path("/test/path")
 
-    # Mock Path.iterdir to raise PermissionError
+    # Mock os.scandir to raise PermissionError
     with (
-        patch("pathlib.Path.iterdir", side_effect=PermissionError("Access denied")),
+        patch("lib.tools.directory_list.os.scandir", side_effect=PermissionError("Access denied")),
         patch("lib.tools.directory_list.logger") as mock_logger,
     ):
         entries = await _list_directory_recursive(test_path, False, False, 3, 0)
@@ -226,6 +270,32 @@ async def test_basic_directory_listing(temp_dir_structure: Path, mock_agent_cont
     # Check header in content
     assert any(line.startswith("# Directory listing for:") for line in result.content)
 
+    # Counts are taken in the same pass that formats the lines, so they must agree with the listing
+    listed = result.content[MIN_CONTENT_LINES:]
+    assert sum(line.endswith("/") for line in listed) == dir_info["directories"]
+    assert len(listed) == dir_info["total_entries"]
+
+
+@pytest.mark.asyncio
+async def test_directory_listing_sizes(temp_dir_structure: Path, mock_agent_context: MagicMock) -> None:
+    """Test that file sizes are only reported when include_size is set."""
+    without_sizes = await list_directory(mock_agent_context, str(temp_dir_structure))
+    with_sizes = await list_directory(mock_agent_context, str(temp_dir_structure), include_size=True)
+
+    assert not any(line.endswith(" bytes)") for line in without_sizes.content)
+    assert f"file1.txt ({len('test content')} bytes)" in with_sizes.content
+
+
+@pytest.mark.asyncio
+async def test_walk_skips_stat_without_sizes(temp_dir_structure: Path) -> None:
+    """Test that entries carry sizes only when requested."""
+    sized = await _list_directory_recursive(temp_dir_structure, False, True, 3, 0, include_size=True)
+    unsized = await _list_directory_recursive(temp_dir_structure, False, True, 3, 0, include_size=False)
+
+    assert any(entry.size for entry in sized)
+    assert all(entry.size == 0 for entry in unsized)
+    assert [entry.path for entry in sized] == [entry.path for entry in unsized]
+
 
 @pytest.mark.asyncio
 async def test_directory_not_found(mock_agent_context: MagicMock) -> None:
@@ -0,0 +1,143 @@
+# ruff: noqa: S101
+import asyncio
+import json
+import re
+import shutil
+from fnmatch import fnmatch
+from pathlib import Path
+
+import pytest
+
+from lib.tools import grep_tool
+from lib.tools.grep_tool import _find_matches, _grep_python, _grep_ripgrep, _read_ripgrep_output, _read_searchable
+from lib.tools.utils import IGNORE_GLOBS, should_ignore_path
+
+# Line number of "bar" in the two-line test content
+SECOND_LINE = 2
+# Files for the worker-process test, more than one chunk per worker on small machines
+POOL_TEST_FILES = 40
+# Search size limit for the parity tree, so the size cut-off is exercised without writing 10 MiB files
+PARITY_MAX_FILE_SIZE = 64
+
+
+def find_lines(content: str, pattern: str, context_lines: int = 0) -> list[tuple[int, str]]:
+    """Return (line_number, line) for every match, searching as the grep tool does."""
+    matches = _find_matches("test.txt", content, re.compile(pattern, re.MULTILINE), context_lines)
+    return [(match["line_number"], match["line"]) for match in matches]
+
+
+@pytest.mark.parametrize("pattern", [r"\s+bar", r"o[^z]+b", r"o\nb"])
+def test_matches_do_not_cross_line_breaks(pattern: str) -> None:
+    """Test that a pattern matching only across a newline reports no line."""
+    assert find_lines("foo\nbar", pattern) == []
+
+
+@pytest.mark.parametrize("pattern", [r"\Abar", r"(?<!\n)^bar", r"^bar\Z", r"bar(?!\n)"])
+def test_line_boundary_assertions_apply_per_line(pattern: str) -> None:
+    """Test that assertions at the start or end of the input treat each line as the whole input."""
+    assert find_lines("foo\nbar\n", pattern) == [(SECOND_LINE, "bar")]
+
+
+def test_each_matching_line_reported_once_with_context() -> None:
+    """Test that a line with several hits is reported once, with its surrounding lines."""
+    matches = _find_matches("test.txt", "foo\nbar bar\nbaz", re.compile("bar", re.MULTILINE), 1)
+
+    assert len(matches) == 1
+    assert matches[0]["line_number"] == SECOND_LINE
+    assert matches[0]["context"] == ["       1: foo", ">>>    2: bar bar", "       3: baz"]
+
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+def test_read_searchable_translates_newlines(tmp_path: Path, newline: str) -> None:
+    """Test that CRLF and CR files are searched as if opened in text mode."""
+    file_path = tmp_path / "windows.txt"
+    file_path.write_bytes(newline.join(["foo", "bar", ""]).encode())
+
+    content = _read_searchable(str(file_path))
+
+    assert content == "foo\nbar\n"
+    assert find_lines(content, "foo$", context_lines=1) == [(1, "foo")]
+
+
+@pytest.mark.parametrize(
+    "name", ["main.py", ".gitignore", ".github", "node_modules", "image.png", ".hidden", "module.pyc", ".env.local"]
+)
+def test_ignore_globs_match_should_ignore_path(name: str) -> None:
+    """Test that the globs passed to ripgrep skip exactly the names the Python search skips."""
+    assert any(fnmatch(name, glob) for glob in IGNORE_GLOBS) == should_ignore_path(name, name)
+
+
+def ripgrep_record(kind: str, **data: object) -> bytes:
+    """Encode one line of ripgrep's --json output."""
+    return json.dumps({"type": kind, "data": data}).encode() + b"\n"
+
+
+@pytest.mark.asyncio
+async def test_read_ripgrep_output_stops_at_max_results() -> None:
+    """Test that ripgrep's records are turned into matches and reading stops once max_results are found."""
+    stdout = asyncio.StreamReader()
+    for path in ("a.py", "b.py"):
+        stdout.feed_data(ripgrep_record("begin", path={"text": path}))
+        stdout.feed_data(ripgrep_record("context", line_number=1, lines={"text": "foo\r\n"}))
+        stdout.feed_data(ripgrep_record("match", line_number=2, lines={"text": "bar\n"}))
+        stdout.feed_data(ripgrep_record("end", path={"text": path}))
+    stdout.feed_eof()
+
+    results, limited = await _read_ripgrep_output(stdout, context_lines=1, max_results=1)
+
+    assert limited
+    assert results["files_with_matches"] == 1
+    assert results["all_matches"] == [
+        {"file_path": "a.py", "line_number": SECOND_LINE, "line": "bar", "context": ["       1: foo", ">>>    2: bar"]}
+    ]
+
+
+def build_search_tree(root: Path) -> None:
+    """Create files both searches must treat alike: hidden, ignored, nested, CRLF and around the size limit."""
+    (root / "src").mkdir()
+    (root / "src" / "main.py").write_text("import os\n\ndef foo():\n    return 'foo'\n")
+    (root / ".hidden.py").write_text("foo = 1\nbar = 2\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "lib.js").write_text("foo\n")
+    (root / "cache.pyc").write_bytes(b"foo\n")
+    (root / "windows.txt").write_bytes(b"first\r\nfoo end\r\nlast\r\n")
+    (root / "at_limit.txt").write_text("foo\n".ljust(PARITY_MAX_FILE_SIZE, "."))
+    (root / "over_limit.txt").write_text("foo\n".ljust(PARITY_MAX_FILE_SIZE + 1, "."))
+
+
+def sorted_matches(results: dict) -> list[dict]:
+    """Order matches by file and line, since ripgrep searches files in parallel."""
+    return sorted(results["all_matches"], key=lambda match: (match["file_path"], match["line_number"]))
+
+
+@pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep is not installed")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern", ["foo", "end$", r"^\s+return"])
+async def test_ripgrep_and_python_searches_agree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, pattern: str) -> None:
+    """Test that ripgrep and the Python fallback report the same matches and context for one tree."""
+    monkeypatch.setattr(grep_tool, "MAX_GREP_FILE_SIZE", PARITY_MAX_FILE_SIZE)
+    build_search_tree(tmp_path)
+
+    ripgrep_results = await _grep_ripgrep(pattern, tmp_path, None, context_lines=1, max_results=100)
+    python_results = await _grep_python(re.compile(pattern, re.MULTILINE), tmp_path, None, 1, 100)
+
+    assert ripgrep_results is not None
+    assert python_results["all_matches"]
+    assert sorted_matches(ripgrep_results) == sorted_matches(python_results)
+    assert not any(match["file_path"].endswith("over_limit.txt") for match in ripgrep_results["all_matches"])
+
+
+@pytest.mark.asyncio
+async def test_process_pool_search_matches_thread_search(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that searching in worker processes finds the same matches, in order, as the in-process search."""
+    for i in range(POOL_TEST_FILES):
+        (tmp_path / f"file{i:02d}.txt").write_text("foo\nbar\nbaz\n" if i % 3 == 0 else "nothing here\n")
+    regex = re.compile("^bar$", re.MULTILINE | re.IGNORECASE)
+
+    monkeypatch.setattr(grep_tool, "PROCESS_POOL_MIN_FILES", POOL_TEST_FILES + 1)
+    thread_results = await _grep_python(regex, tmp_path, None, 1, 100)
+    monkeypatch.setattr(grep_tool, "PROCESS_POOL_MIN_FILES", 1)
+    pool_results = await _grep_python(regex, tmp_path, None, 1, 100)
+
+    assert thread_results["all_matches"]
+    assert pool_results == thread_results